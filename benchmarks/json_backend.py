@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Compare JSON decoding backends on TVD resource files
+
+All backends go through the schema-aware `tvd.core.json.decode`, and are
+compared to historical simplejson decoding with a per-dict `object_hook`.
+
+Usage:
+    json_backend.py [--repeat=<n>] <json>...
+    json_backend.py -h | --help
+
+Arguments:
+    <json>  Resource files (e.g. TVD/TheBigBangTheory/metadata/*/*.json)
+
+Options:
+    --repeat=<n>  Number of times each file is loaded [default: 3].
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import time
+import simplejson
+from docopt import docopt
+
+import tvd.core.json
+from tvd.core.json import JSON_BACKENDS
+
+
+def load_with_object_hook(path, backend=None):
+    """Historical loader: simplejson with per-dict object_hook"""
+    with open(path, 'r') as f:
+        return simplejson.load(f, object_hook=tvd.core.json.object_hook)
+
+
+def benchmark(load, paths, backend, repeat=3):
+    """Best total load time (in seconds) over `repeat` runs"""
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.time()
+        for path in paths:
+            load(path, backend=backend)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    paths = arguments['<json>']
+    repeat = int(arguments['--repeat'])
+
+    size = sum(os.path.getsize(path) for path in paths) / 1e6
+    print('{n:d} file(s), {size:.1f} MB'.format(n=len(paths), size=size))
+
+    # per-dict object_hook is the reference
+    reference = benchmark(load_with_object_hook, paths, None, repeat=repeat)
+    msg = '{backend:>12s}: {elapsed:.3f}s ({rate:.1f} MB/s, x{speedup:.2f})'
+    print(msg.format(backend='object_hook', elapsed=reference,
+                     rate=size / reference, speedup=1.))
+
+    for backend in reversed(JSON_BACKENDS):
+
+        try:
+            tvd.core.json.get_backend(backend)
+        except ImportError:
+            print('{backend:>12s}: not installed'.format(backend=backend))
+            continue
+
+        elapsed = benchmark(tvd.core.json.load, paths, backend, repeat=repeat)
+        print(msg.format(backend=backend, elapsed=elapsed,
+                         rate=size / elapsed, speedup=reference / elapsed))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Measure start-up time of TVD: "import tvd" and plugin instantiation
+
+Each measurement runs in a fresh Python interpreter, first with an empty
+plugin registry cache (cold) then with the cache filled by the previous
+run (warm).
+
+Usage:
+    startup.py [--repeat=<n>] [<series> [<tvd>]]
+    startup.py -h | --help
+
+Arguments:
+    <series>  Series plugin to instantiate (e.g. TheBigBangTheory).
+    <tvd>     Path to TVD root directory (defaults to current directory).
+
+Options:
+    --repeat=<n>  Number of runs per measurement [default: 5].
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from docopt import docopt
+
+IMPORT = """
+import time
+start = time.time()
+import tvd
+print(time.time() - start)
+"""
+
+REGISTRY = """
+import time
+start = time.time()
+import tvd
+names = list(tvd.series_plugins)
+print(time.time() - start)
+"""
+
+INSTANTIATE = """
+import time
+start = time.time()
+import tvd
+series = tvd.series_plugins[{series!r}]({tvd!r}, acknowledgment=False)
+print(time.time() - start)
+"""
+
+
+def run(code, cache_dir):
+    """Time (in seconds) reported by `code` run in a fresh interpreter"""
+
+    env = dict(os.environ, TVD_CACHE_DIR=cache_dir)
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return float(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def benchmark(name, code, repeat=5):
+
+    cache_dir = tempfile.mkdtemp()
+
+    try:
+        cold = []
+        warm = []
+        for _ in range(repeat):
+            shutil.rmtree(cache_dir)
+            os.makedirs(cache_dir)
+            cold.append(run(code, cache_dir))
+            warm.append(run(code, cache_dir))
+
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    msg = '{name:>24s}: {cold:.3f}s (cold cache), {warm:.3f}s (warm cache)'
+    print(msg.format(name=name, cold=min(cold), warm=min(warm)))
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    repeat = int(arguments['--repeat'])
+
+    benchmark('import tvd', IMPORT, repeat=repeat)
+    benchmark('list plugins', REGISTRY, repeat=repeat)
+
+    series = arguments['<series>']
+    if series is not None:
+        root = arguments['<tvd>'] or os.getcwd()
+        code = INSTANTIATE.format(series=series, tvd=root)
+        benchmark('instantiate {s}'.format(s=series), code, repeat=repeat)
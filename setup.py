@@ -58,7 +58,10 @@ setup(
         'path.py >= 5.1',
         'docopt >= 0.6.1',
         'requests >= 2.2.1',
-        'six >= 1.10.0'
+        'urllib3 >= 1.9',
+        'six >= 1.10.0',
+        'futures >= 3.0.5; python_version < "3.2"',
+        'importlib_metadata >= 1.0; python_version < "3.8"'
     ],
     extras_require={
         'rip': [
@@ -34,29 +34,65 @@ __version__ = get_versions()['version']
 del get_versions
 
 import sys
-from pkg_resources import iter_entry_points
 
 from pyannote.core import T, TStart, TEnd, Transcription
 from pyannote.core import Segment, Timeline, Annotation
 from .core import Episode
 from .plugin import Plugin
+from .plugin.registry import SeriesPlugins
 
 __all__ = [
     'Plugin',
     'Episode',
+    'get_series', 'clear_series',
     'Segment', 'Timeline', 'Annotation',
     'T', 'TStart', 'TEnd', 'Transcription'
 ]
 
 # plugin_name --> plugin_class
-series_plugins = {}
+# plugins are only imported when first accessed, either as
+# tvd.series_plugins['TheBigBangTheory'] or tvd.TheBigBangTheory
+series_plugins = SeriesPlugins()
 
-for o in iter_entry_points(group='tvd.series', name=None):
 
-    series = o.name
+def get_series(name, root, acknowledgment=True):
+    """Get series plugin instance, shared by the whole process
 
-    plugin = o.load()
-    series_plugins[series] = plugin
+    Usage
+    -----
+    >>> series = tvd.get_series('TheBigBangTheory', '/path/to/tvd')
+    >>> series is tvd.get_series('TheBigBangTheory', '/path/to/tvd')
+    True
 
-    setattr(sys.modules[__name__], series, plugin)
-    __all__.append(series)
+    See `SeriesPlugins.instance`.
+    """
+    return series_plugins.instance(name, root, acknowledgment=acknowledgment)
+
+
+def clear_series(name=None, root=None):
+    """Forget plugin instances shared by `get_series`
+
+    By default, all of them are forgotten. Use `name` and/or `root` to only
+    forget instances of a given series and/or TVD root directory.
+    """
+    series_plugins.clear_instances(series=name, root=root)
+
+
+def __getattr__(name):
+    # Python 3.7+ (PEP 562): series plugins as lazy module attributes
+    if name.startswith('__') or name not in series_plugins:
+        raise AttributeError(
+            "module '{module}' has no attribute '{name}'".format(
+                module=__name__, name=name))
+    return series_plugins[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(series_plugins.names()))
+
+
+if sys.version_info < (3, 7):
+    # no module-level __getattr__: plugins are imported right away
+    for series in series_plugins:
+        setattr(sys.modules[__name__], series, series_plugins[series])
+        __all__.append(series)
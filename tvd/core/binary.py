@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Binary columnar format for TVD resources
+
+Timeline, Annotation and Transcription resources are stored as NumPy arrays
+in a (compressed) .npz archive:
+
+* segments as `start` and `end` float arrays;
+* labels, tracks, drifting times and node/edge attributes as indices into
+  an interned `strings` table (each entry is the JSON encoding of the
+  original value, so that non-string labels survive the round trip);
+* Transcription edges as `source` and `target` node index arrays.
+
+It round-trips losslessly with the JSON format.
+"""
+
+from __future__ import unicode_literals
+
+import six
+import numpy as np
+import simplejson as json
+from pyannote.core import T, Segment, Timeline, Annotation, Transcription
+from .json import loads as load_json_string
+
+BINARY_TYPE = 'type'
+BINARY_META = 'meta'
+BINARY_STRINGS = 'strings'
+
+
+class _StringTable(object):
+    """Interned table of JSON-encoded values"""
+
+    def __init__(self):
+        super(_StringTable, self).__init__()
+        self.strings = []
+        self._index = {}
+
+    def __call__(self, value):
+        string = json.dumps(value, sort_keys=True, for_json=True,
+                            allow_nan=True)
+        index = self._index.get(string, None)
+        if index is None:
+            index = len(self.strings)
+            self._index[string] = index
+            self.strings.append(string)
+        return index
+
+    def to_array(self):
+        return np.array(self.strings, dtype=np.str_)
+
+
+def _segments(segments):
+    start = np.array([s.start for s in segments], dtype=np.float64)
+    end = np.array([s.end for s in segments], dtype=np.float64)
+    return start, end
+
+
+def _dump_timeline(timeline, strings):
+    start, end = _segments(list(timeline))
+    meta = {'uri': timeline.uri}
+    return meta, {'start': start, 'end': end}
+
+
+def _load_timeline(meta, arrays, strings):
+    segments = [Segment(start=s, end=e)
+                for s, e in zip(arrays['start'].tolist(),
+                                arrays['end'].tolist())]
+    return Timeline(segments=segments, uri=meta['uri'])
+
+
+def _dump_annotation(annotation, strings):
+    tracks = list(annotation.itertracks(label=True))
+    start, end = _segments([s for s, _, _ in tracks])
+    track = np.array([strings(t) for _, t, _ in tracks], dtype=np.int32)
+    label = np.array([strings(l) for _, _, l in tracks], dtype=np.int32)
+    meta = {'uri': annotation.uri, 'modality': annotation.modality}
+    return meta, {'start': start, 'end': end, 'track': track, 'label': label}
+
+
+def _load_annotation(meta, arrays, strings):
+    annotation = Annotation(uri=meta['uri'], modality=meta['modality'])
+    for s, e, t, l in zip(arrays['start'].tolist(), arrays['end'].tolist(),
+                          arrays['track'].tolist(), arrays['label'].tolist()):
+        annotation[Segment(start=s, end=e), strings[t]] = strings[l]
+    return annotation
+
+
+def _dump_transcription(transcription, strings):
+
+    nodes = list(transcription.nodes(data=True))
+    index = {node: n for n, (node, _) in enumerate(nodes)}
+
+    # anchored times are stored as floats, drifting ones as (interned) labels
+    time = np.array([float(node) if node.anchored else np.nan
+                     for node, _ in nodes], dtype=np.float64)
+    drifting = np.array([-1 if node.anchored else strings(node)
+                         for node, _ in nodes], dtype=np.int32)
+    node_attrs = np.array([strings(attrs) for _, attrs in nodes],
+                          dtype=np.int32)
+
+    edges = list(transcription.edges(keys=True, data=True))
+    source = np.array([index[t1] for t1, _, _, _ in edges], dtype=np.int32)
+    target = np.array([index[t2] for _, t2, _, _ in edges], dtype=np.int32)
+    key = np.array([strings(k) for _, _, k, _ in edges], dtype=np.int32)
+    edge_attrs = np.array([strings(attrs) for _, _, _, attrs in edges],
+                          dtype=np.int32)
+
+    meta = {'graph': transcription.graph}
+    return meta, {'time': time, 'drifting': drifting,
+                  'node_attrs': node_attrs, 'source': source,
+                  'target': target, 'key': key, 'edge_attrs': edge_attrs}
+
+
+def _load_transcription(meta, arrays, strings):
+
+    transcription = Transcription(**meta['graph'])
+
+    nodes = []
+    for time, drifting, attrs in zip(arrays['time'].tolist(),
+                                     arrays['drifting'].tolist(),
+                                     arrays['node_attrs'].tolist()):
+        node = T(time) if drifting < 0 else T(strings[drifting])
+        transcription.add_node(node, **strings[attrs])
+        nodes.append(node)
+
+    for source, target, key, attrs in zip(arrays['source'].tolist(),
+                                          arrays['target'].tolist(),
+                                          arrays['key'].tolist(),
+                                          arrays['edge_attrs'].tolist()):
+        transcription.add_edge(nodes[source], nodes[target],
+                               key=strings[key], **strings[attrs])
+
+    return transcription
+
+
+# type name --> (class, dump function, load function)
+_FORMATS = {
+    'Timeline': (Timeline, _dump_timeline, _load_timeline),
+    'Annotation': (Annotation, _dump_annotation, _load_annotation),
+    'Transcription': (Transcription, _dump_transcription, _load_transcription),
+}
+
+
+def supports(data):
+    """Checks whether `data` can be stored in binary format"""
+    return any(isinstance(data, cls) for cls, _, _ in _FORMATS.values())
+
+
+def dump(data, path):
+    """Save resource in binary format
+
+    Raises
+    ------
+    TypeError
+        If `data` is neither a Timeline, an Annotation nor a Transcription.
+    """
+
+    for name, (cls, _dump, _) in six.iteritems(_FORMATS):
+        if isinstance(data, cls):
+            break
+    else:
+        raise TypeError('Cannot store {t} in binary format.'.format(
+            t=type(data).__name__))
+
+    strings = _StringTable()
+    meta, arrays = _dump(data, strings)
+
+    arrays[BINARY_TYPE] = np.array(name, dtype=np.str_)
+    arrays[BINARY_META] = np.array(json.dumps(meta, for_json=True,
+                                              allow_nan=True),
+                                   dtype=np.str_)
+    arrays[BINARY_STRINGS] = strings.to_array()
+
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load(path):
+    """Load resource stored in binary format"""
+
+    with np.load(path, allow_pickle=False) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+
+    name = six.text_type(arrays.pop(BINARY_TYPE))
+    meta = load_json_string(six.text_type(arrays.pop(BINARY_META)))
+
+    # decode interned table at once, as one JSON array
+    strings = load_json_string(
+        '[' + ','.join(arrays.pop(BINARY_STRINGS).tolist()) + ']')
+
+    _, _, _load = _FORMATS[name]
+    return _load(meta, arrays, strings)
@@ -29,12 +29,37 @@
 
 from __future__ import unicode_literals
 
+import io
+import six
+import gzip
+import importlib
 import simplejson as json
+import pyannote.core
 import pyannote.core.json
+from pyannote.core.json import PYANNOTE_JSON
+from pyannote.core.json import PYANNOTE_JSON_CONTENT
+
+try:
+    import lzma
+except ImportError:
+    # Python 2
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
 
 
 TVD_JSON = 'tvd'
 
+# JSON decoding backends
+# all but 'simplejson' are optional (and faster) C decoders
+JSON_BACKENDS = ['orjson', 'rapidjson', 'simplejson']
+
+# backends tried (in this order) when none is selected explicitly
+# orjson is not one of them: it rejects Infinity and -Infinity, found in
+# every transcription (TStart and TEnd)
+DEFAULT_JSON_BACKENDS = ['rapidjson', 'simplejson']
+
 
 def object_hook(d):
     """
@@ -55,12 +80,174 @@ def object_hook(d):
     return d
 
 
-def load(path):
-    with open(path, 'r') as f:
-        data = json.load(f, encoding='utf-8', object_hook=object_hook)
+def _open(path, mode):
+    """Open (possibly compressed) JSON file in text mode
+
+    Compression is chosen based on file extension:
+    '.gz' for gzip, '.xz' for LZMA, none otherwise.
+    Compressed files are (de)compressed on the fly.
+    """
+
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, mode + 'b'),
+                                encoding='utf-8')
+
+    if path.endswith('.xz'):
+        if lzma is None:
+            raise ImportError('.xz support requires lzma module.')
+        return io.TextIOWrapper(lzma.open(path, mode + 'b'),
+                                encoding='utf-8')
+
+    return open(path, mode)
+
+
+def _decode_typed(data):
+    """Rebuild pyannote object, including typed objects nested in it
+
+    Only fields that may hold such objects are decoded: e.g. `uri` of
+    timelines and annotations (often an Episode), or graph attributes of
+    transcriptions -- not the bulk of their content.
+    """
+
+    for key, value in six.iteritems(data):
+        if key != PYANNOTE_JSON_CONTENT and isinstance(value, (list, dict)):
+            data[key] = decode(value)
+
+    # transcription content is a node-link dictionary
+    content = data.get(PYANNOTE_JSON_CONTENT, None)
+    if isinstance(content, dict) and isinstance(content.get('graph', None),
+                                                 dict):
+        content['graph'] = decode(content['graph'])
+
+    cls = getattr(pyannote.core, data[PYANNOTE_JSON])
+    return cls.from_json(data)
+
+
+def decode(data):
+    """Rebuild Episode and pyannote objects from plain decoded JSON
+
+    Schema-aware (top-down) alternative to `object_hook`: typed objects are
+    built directly from their JSON content by the corresponding `from_json`
+    class method, so that their (possibly numerous) inner segment, track or
+    edge dictionaries are never inspected individually.
+    """
+
+    if isinstance(data, dict):
+
+        if TVD_JSON in data:
+            return object_hook(data)
+
+        if PYANNOTE_JSON in data:
+            return _decode_typed(data)
+
+        for key, value in six.iteritems(data):
+            if isinstance(value, (list, dict)):
+                data[key] = decode(value)
+
+        return data
+
+    if isinstance(data, list):
+        for i, item in enumerate(data):
+            if isinstance(item, (list, dict)):
+                data[i] = decode(item)
+        return data
+
     return data
 
 
+def _loads(text):
+    # simplejson >= 4 rejects Infinity and -Infinity unless asked not to
+    return json.loads(text, parse_constant=float)
+
+
+def get_backend(name=None):
+    """Get JSON decoding backend
+
+    Parameters
+    ----------
+    name : str, optional
+        One of JSON_BACKENDS. Defaults to the first installed one among
+        DEFAULT_JSON_BACKENDS.
+
+    Returns
+    -------
+    name : str
+    module : module
+    """
+
+    names = DEFAULT_JSON_BACKENDS if name is None else [name]
+
+    for _name in names:
+        try:
+            return _name, importlib.import_module(_name)
+        except ImportError:
+            continue
+
+    raise ImportError('JSON backend "{name}" is not installed.'.format(
+        name=name))
+
+
+_BACKEND = None
+
+
+def set_backend(name=None):
+    """Select JSON decoding backend used by `load` and `loads`
+
+    Parameters
+    ----------
+    name : str, optional
+        One of JSON_BACKENDS. Defaults to the fastest installed one.
+    """
+    global _BACKEND
+    _BACKEND = get_backend(name=name)
+
+
+def loads(text, backend=None):
+    """Decode JSON text
+
+    Parameters
+    ----------
+    text : str
+    backend : str, optional
+        One of JSON_BACKENDS. Defaults to backend selected by `set_backend`.
+        Falls back to simplejson for texts it cannot decode (e.g. orjson
+        and Infinity).
+    """
+
+    if backend is None:
+        if _BACKEND is None:
+            set_backend()
+        name, module = _BACKEND
+    else:
+        name, module = get_backend(name=backend)
+
+    # decode to plain Python objects first, then rebuild typed objects
+    if name == 'simplejson':
+        data = _loads(text)
+    else:
+        try:
+            data = module.loads(text)
+        except ValueError:
+            data = _loads(text)
+
+    return decode(data)
+
+
+def load(path, backend=None):
+    """Load JSON file
+
+    Parameters
+    ----------
+    path : str
+        Path to (possibly compressed) JSON file
+    backend : str, optional
+        One of JSON_BACKENDS. Defaults to backend selected by `set_backend`.
+    """
+
+    with _open(path, 'r') as f:
+        return loads(f.read(), backend=backend)
+
+
 def dump(data, path):
-    with open(path, 'w') as f:
-        json.dump(data, f, encoding='utf-8', for_json=True)
+    with _open(path, 'w') as f:
+        json.dump(data, f, encoding='utf-8', for_json=True, allow_nan=True)
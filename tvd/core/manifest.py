@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Series-level resource manifest
+
+The manifest is a JSON file listing, for each resource stored on disk,
+its episode, resource type, path, size, modification time, SHA-256
+content hash, source URL and fingerprint. It makes availability checks
+and "what's missing" reports in-memory look-ups, and allows to check the
+integrity of stored resources.
+"""
+
+from __future__ import unicode_literals
+
+import os
+import hashlib
+import logging
+import threading
+import simplejson as json
+
+from .episode import Episode
+from .util import atomic_write, lock_file
+
+MANIFEST_EPISODE = 'episode'
+MANIFEST_RESOURCE = 'resource'
+MANIFEST_PATH = 'path'
+MANIFEST_BINARY = 'binary'
+MANIFEST_SIZE = 'size'
+MANIFEST_MTIME = 'mtime'
+MANIFEST_SHA256 = 'sha256'
+MANIFEST_URL = 'url'
+MANIFEST_FINGERPRINT = 'fingerprint'
+
+
+def _key(episode, resource_type):
+    return '{episode!s}/{resource_type}'.format(
+        episode=episode, resource_type=resource_type)
+
+
+def sha256(path, chunk_size=1 << 20):
+    """SHA-256 hash of file content"""
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Manifest(object):
+    """Resource manifest
+
+    Parameters
+    ----------
+    path : str
+        Path to manifest file. Loaded if it exists.
+    root : str
+        Resource paths are stored relative to this directory.
+    flush_every : int, optional
+        Only save manifest to disk once every `flush_every` updated entries
+        (see `flush`). Defaults to saving after every update.
+
+    Several instances (e.g. in several processes) can share the same
+    manifest file: each one only writes its own changes, merged with the
+    current content of the file.
+    """
+
+    def __init__(self, path, root, flush_every=1):
+        super(Manifest, self).__init__()
+
+        self.path = path
+        self.root = root
+        self.flush_every = flush_every
+        # key --> entry (or None, once removed), for entries updated since
+        # manifest was last saved
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        self._entries = self._load()
+
+    def _load(self):
+        """Read entries from disk (none if missing or corrupted)"""
+
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+
+        except (IOError, OSError):
+            return {}
+
+        # corrupted manifest is rebuilt as resources get saved
+        except ValueError as e:
+            msg = 'ignoring corrupted manifest {path}: {e}'
+            logging.warning(msg.format(path=self.path, e=e))
+            return {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, episode_resource_type):
+        return _key(*episode_resource_type) in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries.values()))
+
+    def get(self, episode, resource_type):
+        """Get manifest entry (None if resource is not listed)"""
+        return self._entries.get(_key(episode, resource_type), None)
+
+    def absolute(self, path):
+        """Absolute path of resource file listed in manifest"""
+        return os.path.join(self.root, path)
+
+    def make_entry(self, episode, resource_type, path, binary=None, url=None,
+                   fingerprint=None):
+        """Describe resource file
+
+        Parameters
+        ----------
+        episode : Episode
+        resource_type : str
+        path : str
+            Path to (JSON) resource file
+        binary : str, optional
+            Path to binary version of resource, if any.
+        url : str, optional
+            Source URL
+        fingerprint : str, optional
+            Fingerprint of the parameters used to obtain the resource.
+
+        Returns
+        -------
+        entry : dict
+        """
+
+        stat = os.stat(path)
+
+        entry = {
+            MANIFEST_EPISODE: [episode.series, episode.season,
+                               episode.episode],
+            MANIFEST_RESOURCE: resource_type,
+            MANIFEST_PATH: os.path.relpath(path, self.root),
+            MANIFEST_SIZE: stat.st_size,
+            MANIFEST_MTIME: stat.st_mtime,
+            MANIFEST_SHA256: sha256(path),
+            MANIFEST_URL: url,
+            MANIFEST_FINGERPRINT: fingerprint,
+        }
+
+        if binary is not None:
+            entry[MANIFEST_BINARY] = os.path.relpath(binary, self.root)
+
+        return entry
+
+    def update(self, entries):
+        """Add (or replace) entries
+
+        Manifest is saved once `flush_every` entries are pending.
+        """
+
+        with self._lock:
+            for entry in entries:
+                episode = Episode(*entry[MANIFEST_EPISODE])
+                key = _key(episode, entry[MANIFEST_RESOURCE])
+                self._entries[key] = entry
+                self._pending[key] = entry
+            if len(self._pending) >= self.flush_every:
+                self._save()
+
+    def flush(self):
+        """Save pending entries (if any) to disk"""
+
+        with self._lock:
+            if self._pending:
+                self._save()
+
+    def remove(self, episode, resource_type):
+        """Remove entry (if any) and save manifest"""
+
+        key = _key(episode, resource_type)
+
+        with self._lock:
+            if self._entries.pop(key, None):
+                self._pending[key] = None
+                self._save()
+
+    def _save(self):
+
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # other instances may have saved their own entries since this one
+        # was loaded: merge them (the lock prevents them from doing the same
+        # at the same time)
+        with lock_file(self.path + '.lock'):
+
+            entries = self._load()
+            for key, entry in self._pending.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+
+            with atomic_write(self.path) as f:
+                json.dump(entries, f, sort_keys=True)
+
+        self._entries = entries
+        self._pending = {}
+
+    def verify(self, entry):
+        """Check integrity of resource file
+
+        Returns
+        -------
+        error : str or None
+            None if resource file exists and matches its size and content
+            hash, description of the problem otherwise.
+        """
+
+        path = self.absolute(entry[MANIFEST_PATH])
+
+        if not os.path.exists(path):
+            return '{path} does not exist'.format(path=path)
+
+        if os.path.getsize(path) != entry[MANIFEST_SIZE]:
+            return '{path} size does not match'.format(path=path)
+
+        if sha256(path) != entry[MANIFEST_SHA256]:
+            return '{path} content does not match'.format(path=path)
+
+        return None
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Packed resource store
+
+All resources of a series are consolidated into one file, made of
+
+* a fixed-size header (magic string, offset and length of the index);
+* the JSON encoding of every resource, one after the other;
+* a JSON index mapping "<episode>/<resource_type>" keys to the offset and
+  length of the corresponding resource.
+
+Packs are read through `mmap`, so that only the pages holding requested
+resources are actually read from disk.
+"""
+
+from __future__ import unicode_literals
+
+import os
+import mmap
+import struct
+import threading
+import simplejson as json
+
+from .json import loads
+from .util import atomic_write
+
+PACK_MAGIC = b'TVDPACK1'
+PACK_HEADER = struct.Struct('<8sQQ')
+
+
+def _key(episode, resource_type):
+    return '{episode!s}/{resource_type}'.format(
+        episode=episode, resource_type=resource_type)
+
+
+class PackWriter(object):
+    """Write resources to a new pack
+
+    Pack is written to a temporary file that replaces `path` on `close`.
+
+    Usage
+    -----
+    >>> with PackWriter(path) as pack:
+    ...     pack.add(episode, resource_type, resource)
+    """
+
+    def __init__(self, path):
+        super(PackWriter, self).__init__()
+        self.path = path
+        self._writing = atomic_write(path, mode='wb')
+        self._f = self._writing.__enter__()
+        self._f.write(PACK_HEADER.pack(PACK_MAGIC, 0, 0))
+        self._index = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._writing.__exit__(exc_type, exc_value, traceback)
+
+    def add(self, episode, resource_type, resource):
+        data = json.dumps(resource, for_json=True,
+                          allow_nan=True).encode('utf-8')
+        self._index[_key(episode, resource_type)] = (self._f.tell(),
+                                                     len(data))
+        self._f.write(data)
+
+    def close(self):
+
+        index = json.dumps(self._index).encode('utf-8')
+        offset = self._f.tell()
+        self._f.write(index)
+
+        self._f.seek(0)
+        self._f.write(PACK_HEADER.pack(PACK_MAGIC, offset, len(index)))
+
+        self._writing.__exit__(None, None, None)
+
+
+class Pack(object):
+    """Read-only, memory-mapped pack
+
+    Parameters
+    ----------
+    path : str
+    """
+
+    def __init__(self, path):
+        super(Pack, self).__init__()
+
+        self.path = path
+
+        with open(path, 'rb') as f:
+            # resources saved after this time are newer than packed ones
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, offset, length = PACK_HEADER.unpack_from(self._mmap, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError('{path} is not a TVD pack.'.format(path=path))
+
+        index = self._mmap[offset:offset + length].decode('utf-8')
+        self._index = json.loads(index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, episode_resource_type):
+        return _key(*episode_resource_type) in self._index
+
+    def get_text(self, episode, resource_type):
+        """Get JSON text of resource (without decoding it)"""
+        offset, length = self._index[_key(episode, resource_type)]
+        return self._mmap[offset:offset + length].decode('utf-8')
+
+    def size(self, episode, resource_type):
+        """Size of (JSON-encoded) resource, in bytes"""
+        _, length = self._index[_key(episode, resource_type)]
+        return length
+
+    def load(self, episode, resource_type):
+        """Load resource
+
+        Raises
+        ------
+        KeyError
+            If resource is not in the pack
+        """
+        return loads(self.get_text(episode, resource_type))
+
+    def close(self):
+        self._mmap.close()
+
+
+# path --> Pack, shared by all plugin instances of this process
+_PACKS = {}
+_PACKS_LOCK = threading.Lock()
+
+
+def open_pack(path):
+    """Get (cached) pack
+
+    Returns
+    -------
+    pack : Pack or None
+        None if `path` does not exist.
+    """
+
+    with _PACKS_LOCK:
+
+        if path not in _PACKS:
+            _PACKS[path] = Pack(path) if os.path.exists(path) else None
+
+        return _PACKS[path]
+
+
+def forget_pack(path):
+    """Make next `open_pack` call re-open `path` (e.g. once rewritten)"""
+
+    with _PACKS_LOCK:
+        _PACKS.pop(path, None)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""SQLite resource store
+
+One SQLite database per TVD root directory, with one row per
+(series, season, episode, resource type) holding the JSON encoding of the
+resource. The database is switched to WAL mode when created, so that many
+reader processes can share it while one process writes. Readers never
+write to it (and can therefore use a read-only copy).
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sqlite3
+import threading
+import simplejson as json
+
+from .json import loads
+from .episode import Episode
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS resources (
+        series TEXT NOT NULL,
+        season INTEGER NOT NULL,
+        episode INTEGER NOT NULL,
+        resource_type TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (series, season, episode, resource_type)
+    )""",
+    # "all episodes with resource X"
+    # (primary key already covers "all resources for season N")
+    """CREATE INDEX IF NOT EXISTS resources_by_type
+       ON resources (series, resource_type, season, episode)""",
+]
+
+
+class SQLiteStore(object):
+    """SQLite resource store
+
+    Parameters
+    ----------
+    path : str
+        Path to SQLite database.
+    create : bool, optional
+        Create database (and its schema) if needed, in WAL mode.
+        Otherwise, the database is only read (and should already exist).
+    """
+
+    def __init__(self, path, create=False):
+        super(SQLiteStore, self).__init__()
+        self.path = path
+        self._reset()
+
+        if create:
+            connection = self._connection()
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+
+    def _reset(self):
+        # sqlite3 connections cannot be shared between threads...
+        self._local = threading.local()
+        # ... nor with forked (e.g. process pool) children
+        self._pid = os.getpid()
+
+    def _connection(self):
+
+        if self._pid != os.getpid():
+            self._reset()
+
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.)
+            self._local.connection = connection
+        return connection
+
+    def __contains__(self, episode_resource_type):
+        episode, resource_type = episode_resource_type
+        cursor = self._connection().execute(
+            'SELECT 1 FROM resources WHERE series=? AND season=? '
+            'AND episode=? AND resource_type=?',
+            (episode.series, episode.season, episode.episode, resource_type))
+        return cursor.fetchone() is not None
+
+    def get_text(self, episode, resource_type):
+        """Get JSON text of resource (without decoding it)
+
+        Raises
+        ------
+        KeyError
+            If resource is not in the store
+        """
+
+        cursor = self._connection().execute(
+            'SELECT data FROM resources WHERE series=? AND season=? '
+            'AND episode=? AND resource_type=?',
+            (episode.series, episode.season, episode.episode, resource_type))
+        row = cursor.fetchone()
+
+        if row is None:
+            raise KeyError((episode, resource_type))
+
+        return row[0]
+
+    def get_size(self, episode, resource_type):
+        """Size of (JSON-encoded) resource"""
+
+        cursor = self._connection().execute(
+            'SELECT length(data) FROM resources WHERE series=? AND season=? '
+            'AND episode=? AND resource_type=?',
+            (episode.series, episode.season, episode.episode, resource_type))
+        row = cursor.fetchone()
+
+        if row is None:
+            raise KeyError((episode, resource_type))
+
+        return row[0]
+
+    def load(self, episode, resource_type):
+        """Load resource
+
+        Raises
+        ------
+        KeyError
+            If resource is not in the store
+        """
+        return loads(self.get_text(episode, resource_type))
+
+    def put(self, episode, resource_type, resource):
+        """Add (or replace) resource"""
+        self.put_many([(episode, resource_type, resource)])
+
+    def put_many(self, items):
+        """Add (or replace) many resources in one transaction
+
+        Parameters
+        ----------
+        items : iterable
+            (episode, resource_type, resource) iterable
+        """
+
+        rows = ((episode.series, episode.season, episode.episode,
+                 resource_type,
+                 json.dumps(resource, for_json=True, allow_nan=True))
+                for episode, resource_type, resource in items)
+
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO resources '
+                '(series, season, episode, resource_type, data) '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+
+    def query(self, series, resource_type=None, season=None):
+        """Find resources of `series`
+
+        Both "all episodes with resource X" and "all resources for season N"
+        queries are answered from an index.
+
+        Parameters
+        ----------
+        series : str
+        resource_type : str, optional
+            Only return resources of this type.
+        season : int, optional
+            Only return resources for this season.
+
+        Returns
+        -------
+        resources : list
+            (episode, resource_type) list, in episode chronological order
+            (then resource type alphabetical order).
+        """
+
+        sql = 'SELECT season, episode, resource_type FROM resources ' \
+              'WHERE series=?'
+        args = [series]
+
+        if resource_type is not None:
+            sql += ' AND resource_type=?'
+            args.append(resource_type)
+
+        if season is not None:
+            sql += ' AND season=?'
+            args.append(season)
+
+        sql += ' ORDER BY season, episode, resource_type'
+
+        cursor = self._connection().execute(sql, args)
+
+        return [(Episode(series=series, season=season_number,
+                         episode=episode_number), resource_type_)
+                for season_number, episode_number, resource_type_ in cursor]
+
+
+# path --> SQLiteStore, shared by all plugin instances of this process
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_store(path, create=False):
+    """Get (cached) store
+
+    Parameters
+    ----------
+    path : str
+    create : bool, optional
+        Create store if it does not exist yet.
+
+    Returns
+    -------
+    store : SQLiteStore or None
+        None if `path` does not exist (and `create` is False). This is
+        remembered: use `forget_store` if it might have been created since.
+    """
+
+    with _STORES_LOCK:
+
+        if path not in _STORES:
+            exists = os.path.exists(path)
+            _STORES[path] = SQLiteStore(path) if exists else None
+
+        if _STORES[path] is None and create:
+            _STORES[path] = SQLiteStore(path, create=True)
+
+        return _STORES[path]
+
+
+def forget_store(path):
+    """Make next `open_store` call re-open `path` (e.g. once created)"""
+
+    with _STORES_LOCK:
+        _STORES.pop(path, None)
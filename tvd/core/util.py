@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""File system helpers"""
+
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+
+# Python 2 has no os.replace
+_replace = getattr(os, 'replace', os.rename)
+
+
+def set_default_mode(path):
+    """Give file created by `tempfile.mkstemp` the usual permissions
+
+    `mkstemp` creates files readable by their owner only (0600): this makes
+    them (e.g. 0644, depending on umask) readable by other users of a
+    shared TVD root directory, like files created with `open`.
+    """
+
+    # os.umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+
+    os.chmod(path, 0o666 & ~umask)
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w'):
+    """Write file through a temporary file, moved to `path` once complete
+
+    Concurrent readers of `path` never see a partially written file. The
+    file gets the usual permissions (see `set_default_mode`). On failure,
+    `path` is left untouched and the temporary file is removed.
+
+    Usage
+    -----
+    >>> with atomic_write(path) as f:
+    ...     f.write(data)
+    """
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        set_default_mode(tmp)
+        _replace(tmp, path)
+
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+@contextlib.contextmanager
+def lock_file(path):
+    """Hold exclusive lock on `path` (created if needed) for other processes
+
+    Advisory lock, only effective between processes that also use it.
+    No-op where `fcntl` is not available.
+    """
+
+    if fcntl is None:
+        yield
+        return
+
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
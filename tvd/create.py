@@ -34,13 +34,19 @@
 * /rip/ mode extracts videos, audio tracks and subtitles from dumped DVDs.
 * /stream/ mode reencodes videos for streaming.
 * /metadata/ mode downloads available metadata.
+* /pack/ mode consolidates downloaded metadata into one file.
+* /store/ mode copies downloaded metadata into TVD SQLite store.
+* /verify/ mode checks integrity of downloaded metadata.
 
 Usage:
     create list
     create dump [options] [--dvd=<mount>] [--vobcopy=<p>] <tvd> <series> <season> <disc>
     create rip [options] [--lsdvd=<p> --HandBrakeCLI=<p> --mencoder=<p> --vobsub2srt=<p> --avconv=<p> --tessdata=<p> --sndfile-resample=<p>] <tvd> <series> <season>
     create stream [options] [--avconv=<p>] <tvd> <series>
-    create metadata [options] <tvd> <series>
+    create metadata [options] [--jobs=<n> --compression=<c> --binary --sync] <tvd> <series>
+    create pack [options] <tvd> <series>
+    create store [options] <tvd> <series>
+    create verify [options] <tvd> <series>
 
 Arguments:
     <tvd>     Path to TVD root directory.
@@ -61,6 +67,11 @@ Options:
     --tessdata=<p>            Path to "tessdata" directory prefix [default: /tessdata].
     --avconv=<p>              Path to "avconv" (in case it is not in PATH).
     --sndfile-resample=<p>    Path to "sndfile-resample" (in case it is not in PATH).
+
+    -j <n> --jobs=<n>         Number of parallel metadata workers [default: 1].
+    --compression=<c>         Compress metadata files ("gz" or "xz").
+    --binary                  Also save metadata in binary (.npz) format.
+    --sync                    Only (re)download missing or outdated metadata.
 """
 
 from __future__ import unicode_literals
@@ -68,12 +79,13 @@ from __future__ import print_function
 
 import re
 import sys
+import time
 import logging
 from path import path
 
 import tvd
-import tvd.core.json
 from .core import Episode
+from .plugin.path import RESOURCE_COMPRESSIONS
 from .rip import TVSeriesDVDSet
 from .rip import Vobcopy
 from .rip import HandBrakeCLI
@@ -326,38 +338,202 @@ def do_stream(series, avconv=None, force=False, verbose=False):
 # -------------------------------------------------------------------------
 
 
-def do_metadata(series, force=False, verbose=False):
+def _get_and_dump_resource(series, episode, resource_type, update=False):
+
+    resource = series.get_resource(resource_type, episode, update=update)
+    series.save_resource(resource_type, episode, resource)
+
+
+def do_metadata(
+    series, force=False, verbose=False, jobs=1, compression=None,
+    binary=False, sync=False
+):
+    """Download (and save to disk) all available metadata
+
+    Parameters
+    ----------
+    series : Plugin
+    force : bool, optional
+        Overwrite existing files.
+    verbose : bool, optional
+    jobs : int, optional
+        Number of worker processes. Defaults to 1 (i.e. sequential download).
+        Resources are obtained by worker processes (see
+        ResourceMixin.build_resources) and saved by this process.
+    compression : {None, 'gz', 'xz'}, optional
+        Compress metadata files. Defaults to plain JSON.
+    binary : bool, optional
+        Also save metadata in binary format (see tvd.core.binary).
+    sync : bool, optional
+        Only get resources that are missing or outdated, i.e. whose
+        parameters (URL, source), plugin version or method changed since
+        they were saved (see ResourceMixin.resource_fingerprint).
+        Outdated resources are obtained from plugin, not from disk.
+
+    Raises
+    ------
+    ValueError
+        If `compression` is not supported.
+    """
+
+    # fail once, before getting any resource
+    if compression not in RESOURCE_COMPRESSIONS:
+        raise ValueError(
+            'unsupported compression "{compression}" (use "gz" or "xz")'
+            .format(compression=compression))
 
     if verbose:
         logging.basicConfig(level=logging.INFO)
 
+    series.RESOURCE_COMPRESSION = compression
+    series.RESOURCE_BINARY = binary
+
+    # gather resources that actually need to be downloaded
+    todo = []
+    skipped = 0
+
     # loop on all available resources
     for episode, resource_type in series.iter_resources(
         resource_type=None, episode=None, data=False
     ):
 
-        # save resource to PATTERN_RESOURCE in JSON format
-        json_to = series.path_to_resource(episode, resource_type)
-        logging.info('{episode}: downloading "{resource}".'.format(
-            episode=episode, resource=resource_type))
+        # do not re-generate existing (and up to date) file
+        if sync:
+            exists = not series.is_outdated(resource_type, episode)
+        else:
+            exists = series.on_disk(resource_type, episode)
 
-        # do not re-generate existing file
-        if path(json_to).exists() and not force:
+        if exists and not force:
             logging.info('{episode}: "{resource}" already exists.'.format(
                 episode=episode, resource=resource_type))
+            skipped += 1
             continue
 
-        try:
-            resource = series.get_resource(resource_type, episode)
-        except Exception as e:
-            logging.error('{episode}: failed to download "{resource}".'.format(
-                episode=episode, resource=resource_type))
-            logging.error(e)
-            continue
+        todo.append((episode, resource_type))
+
+    done = 0
+    failed = 0
+    start = time.time()
+
+    def _failure(episode, resource_type, e):
+        logging.error('{episode}: failed to download "{resource}".'.format(
+            episode=episode, resource=resource_type))
+        logging.error(e)
+
+    # manifest is only saved once in a while (see save_resource)
+    try:
+
+        if jobs > 1:
+
+            for episode, resource_type in todo:
+                logging.info('{episode}: downloading "{resource}".'.format(
+                    episode=episode, resource=resource_type))
+
+            # resources are saved as soon as they are ready
+            for episode, resource_type, resource, error in \
+                    series.build_resources(todo, max_workers=jobs):
+
+                if error is None:
+                    try:
+                        series.save_resource(resource_type, episode, resource)
+                    except Exception as e:
+                        error = e
+
+                if error is None:
+                    done += 1
+                else:
+                    _failure(episode, resource_type, error)
+                    failed += 1
+
+        else:
+
+            for episode, resource_type in todo:
+                logging.info('{episode}: downloading "{resource}".'.format(
+                    episode=episode, resource=resource_type))
+                # never reuse existing (or outdated) files: get them from
+                # plugin, as worker processes do
+                try:
+                    _get_and_dump_resource(series, episode, resource_type,
+                                           update=force or sync)
+                except Exception as e:
+                    _failure(episode, resource_type, e)
+                    failed += 1
+                else:
+                    done += 1
+
+    finally:
+        series.flush_manifest()
+        series.forget_downloads()
+
+    elapsed = time.time() - start
+    print(
+        '{done:d} resource(s) downloaded, {failed:d} failed, '
+        '{skipped:d} skipped in {elapsed:.1f}s '
+        '({rate:.2f} resources/s, {jobs:d} job(s)).'.format(
+            done=done, failed=failed, skipped=skipped, elapsed=elapsed,
+            rate=(done + failed) / elapsed if elapsed > 0 else 0.,
+            jobs=jobs))
+
+# -------------------------------------------------------------------------
+
+
+def do_pack(series, verbose=False):
+
+    if verbose:
+        logging.basicConfig(level=logging.INFO)
 
-        # create containing directory if needed
-        path(json_to).dirname().makedirs_p()
-        tvd.core.json.dump(resource, json_to)
+    start = time.time()
+    packed = series.pack_resources()
+    elapsed = time.time() - start
+
+    msg = '{packed:d} resource(s) packed into {path} in {elapsed:.1f}s.'
+    print(msg.format(
+        packed=packed, path=series.path_to_pack(), elapsed=elapsed))
+
+# -------------------------------------------------------------------------
+
+
+def do_store(series, verbose=False):
+
+    if verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    start = time.time()
+    stored = series.store_resources()
+    elapsed = time.time() - start
+
+    msg = '{stored:d} resource(s) stored into {path} in {elapsed:.1f}s.'
+    print(msg.format(
+        stored=stored, path=series.path_to_store(), elapsed=elapsed))
+
+# -------------------------------------------------------------------------
+
+
+def do_verify(series, verbose=False):
+
+    if verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    # resources saved before manifests were introduced
+    added = series.update_manifest()
+    if added:
+        logging.info('{added:d} resource(s) added to manifest.'.format(
+            added=added))
+
+    for episode, resource_type in series.missing_resources():
+        logging.info('{episode}: "{resource}" is missing.'.format(
+            episode=episode, resource=resource_type))
+
+    errors = series.verify_resources()
+    for (episode, resource_type), error in sorted(errors.items()):
+        logging.error('{episode}: "{resource}" is corrupted ({error}).'.format(
+            episode=episode, resource=resource_type, error=error))
+
+    print('{n:d} resource(s) in manifest, {missing:d} missing, '
+          '{corrupted:d} corrupted.'.format(
+              n=len(series.manifest),
+              missing=len(series.missing_resources()),
+              corrupted=len(errors)))
 
 # -------------------------------------------------------------------------
 
@@ -434,5 +610,27 @@ if __name__ == '__main__':
         do_metadata(
             series,
             force=ARGUMENTS['--force'],
+            verbose=ARGUMENTS['--verbose'],
+            jobs=int(ARGUMENTS['--jobs']),
+            compression=ARGUMENTS['--compression'],
+            binary=ARGUMENTS['--binary'],
+            sync=ARGUMENTS['--sync']
+        )
+
+    elif ARGUMENTS['pack']:
+        do_pack(
+            series,
+            verbose=ARGUMENTS['--verbose']
+        )
+
+    elif ARGUMENTS['store']:
+        do_store(
+            series,
+            verbose=ARGUMENTS['--verbose']
+        )
+
+    elif ARGUMENTS['verify']:
+        do_verify(
+            series,
             verbose=ARGUMENTS['--verbose']
         )
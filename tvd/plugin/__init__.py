@@ -34,13 +34,20 @@ from __future__ import division
 import logging
 import wave
 import contextlib
-import yaml
-from pkg_resources import resource_filename
 
 from ..core import Episode
 from .resource import ResourceMixin
 from .path import PathMixin
 from .rip import RipMixin
+from .registry import resource_filename
+from .config import load_config
+
+try:
+    from .aio import AsyncResourceMixin
+except SyntaxError:
+    # asyncio API requires Python 3.6+
+    class AsyncResourceMixin(object):
+        pass
 
 CONFIG_HUMAN_READABLE_NAME = 'name'
 CONFIG_ORIGINAL_LANGUAGE = 'language'
@@ -48,7 +55,7 @@ CONFIG_EPISODES = 'episodes'
 CONFIG_RESOURCES = 'resources'
 
 
-class Plugin(ResourceMixin, PathMixin, RipMixin):
+class Plugin(ResourceMixin, AsyncResourceMixin, PathMixin, RipMixin):
 
     def __init__(self, root, acknowledgment=True):
         super(Plugin, self).__init__()
@@ -57,9 +64,9 @@ class Plugin(ResourceMixin, PathMixin, RipMixin):
         self.acknowledgment = acknowledgment
 
         # obtain path to YAML configuration file and load it
+        # (parsed configuration is cached, see tvd.plugin.config)
         path = resource_filename(self.__class__.__name__, 'tvd.yml')
-        with open(path, mode='r') as f:
-            self.config = yaml.load(f)
+        self.config = load_config(path)
 
         # human readable name is obtained from YAML configuration file
         self.name = self.config[CONFIG_HUMAN_READABLE_NAME]
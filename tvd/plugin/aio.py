@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+# guards lazy creation of per-plugin executors
+_EXECUTOR_LOCK = threading.Lock()
+
+# Python 3.6 has no asyncio.get_running_loop
+_get_running_loop = getattr(asyncio, 'get_running_loop',
+                            asyncio.get_event_loop)
+
+
+class AsyncResourceMixin(object):
+    """asyncio counterparts of ResourceMixin resource getters
+
+    Blocking lookups (disk, plugin) are run in a thread pool shared by all
+    coroutines using this plugin, so that they never block the event loop.
+    Its size bounds the number of concurrent lookups.
+
+    Requires Python 3.6+.
+    """
+
+    # maximum number of concurrent blocking lookups
+    ASYNC_CONCURRENCY = 8
+
+    def _get_async_executor(self):
+
+        # lazily create executor (only when async API is actually used)
+        with _EXECUTOR_LOCK:
+            if getattr(self, '_async_executor', None) is None:
+                self._async_executor = ThreadPoolExecutor(
+                    max_workers=self.ASYNC_CONCURRENCY)
+
+        return self._async_executor
+
+    async def aget_resource(self, resource_type, episode, update=False):
+        """Get resource without blocking the event loop
+
+        See `get_resource` for parameters.
+        """
+
+        # memory look-up is cheap: no need for a thread
+        if not update:
+            try:
+                return self.get_resource_from_memory(resource_type, episode)
+            except ValueError:
+                pass
+
+        # memory was just missed: do not look it up (and miss it) again
+        loop = _get_running_loop()
+        func = functools.partial(self._get_resource, resource_type, episode,
+                                 update=update, memory=False)
+        result, _ = await loop.run_in_executor(self._get_async_executor(),
+                                               func)
+        return result
+
+    async def aiter_resources(self, resource_type=None, episode=None,
+                              update=False, concurrency=None):
+        """Asynchronous resource iterator
+
+        Resources are yielded in the same order as `iter_resources` but up to
+        `concurrency` of them are looked up concurrently.
+
+        Parameters
+        ----------
+        resource_type : str, optional
+            When provided, only iterate over this resource type
+        episode : `tvd.Episode`, optional
+            When provided, only iterate over resources for this episode
+        update : boolean, optional
+        concurrency : int, optional
+            Maximum number of resources looked up ahead of the consumer.
+            Defaults to ASYNC_CONCURRENCY.
+
+        Returns
+        -------
+        (episode, resource_type, data) asynchronous iterator
+        """
+
+        if concurrency is None:
+            concurrency = self.ASYNC_CONCURRENCY
+
+        items = self.iter_resources(resource_type=resource_type,
+                                    episode=episode, data=False)
+
+        # sliding window of pending lookups, in iteration order
+        pending = collections.deque()
+
+        def _schedule():
+            item = next(items, None)
+            if item is None:
+                return
+            _episode, _resource_type = item
+            future = asyncio.ensure_future(self.aget_resource(
+                _resource_type, _episode, update=update))
+            pending.append((_episode, _resource_type, future))
+
+        try:
+            for _ in range(concurrency):
+                _schedule()
+
+            while pending:
+                _episode, _resource_type, future = pending.popleft()
+                _data = await future
+                _schedule()
+                yield _episode, _resource_type, _data
+
+        finally:
+            # consumer stopped early or lookup failed
+            for _, _, future in pending:
+                future.cancel()
+
+    async def aget_all_resources(self, update=False, concurrency=None):
+        """Get all resources concurrently
+
+        Returns
+        -------
+        resources : dict
+            resources[episode][resource_type] contains requested resource
+        """
+
+        resources = {}
+
+        async for episode, resource_type, resource in self.aiter_resources(
+            resource_type=None, episode=None, update=update,
+            concurrency=concurrency
+        ):
+            resources.setdefault(episode, {})[resource_type] = resource
+
+        return resources
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+from __future__ import unicode_literals
+
+import sys
+import time
+import threading
+import collections
+from six.moves import cPickle as pickle
+
+
+def approximate_size(value):
+    """Approximate memory footprint of `value` (in bytes)
+
+    Uses the size of its pickled representation, which is cheap to compute
+    for pyannote objects and scales with their actual memory usage.
+    """
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class ResourceCache(object):
+    """Memory-bounded LRU cache of loaded resources
+
+    Least recently used entries are evicted as soon as either the number of
+    entries exceeds `max_entries` or their total (approximate) size exceeds
+    `max_bytes`. Any object implementing `get`, `set`, `evict` and
+    `__contains__` can be used in place of this class (see
+    `ResourceMixin.init_cache`).
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of cached resources. Defaults to no limit.
+    max_bytes : int, optional
+        Approximate maximum memory footprint. Defaults to no limit.
+    sizeof : callable, optional
+        Used to estimate the size of resources whose size is not provided to
+        `set`. Defaults to `approximate_size`.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None):
+        super(ResourceCache, self).__init__()
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        if sizeof is None:
+            sizeof = approximate_size
+        self.sizeof = sizeof
+
+        # key --> (value, size), from least to most recently used
+        self._data = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        """Get cached value and mark it as most recently used
+
+        Raises
+        ------
+        KeyError
+            If `key` is not cached.
+        """
+
+        with self._lock:
+
+            try:
+                value, size = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+
+            self._data[key] = (value, size)
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value, size=None):
+        """Cache value (evicting least recently used values if needed)
+
+        Parameters
+        ----------
+        key : hashable
+        value : object
+        size : int, optional
+            Size of `value`, in bytes. Estimated with `sizeof` when missing.
+            Unused when cache has no `max_bytes` limit.
+        """
+
+        if size is None:
+            size = 0 if self.max_bytes is None else self.sizeof(value)
+
+        with self._lock:
+
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = (value, size)
+            self.nbytes += size
+
+            # always keep most recently used value, even if larger than budget
+            while len(self._data) > 1 and self._is_full():
+                key = next(iter(self._data))
+                self._remove(key)
+                self.evictions += 1
+
+    def _is_full(self):
+
+        if self.max_entries is not None and \
+           len(self._data) > self.max_entries:
+            return True
+
+        if self.max_bytes is not None and \
+           self.nbytes > self.max_bytes:
+            return True
+
+        return False
+
+    def _remove(self, key):
+        _, size = self._data.pop(key)
+        self.nbytes -= size
+
+    def evict(self, key=None):
+        """Evict one value (or all of them)
+
+        Parameters
+        ----------
+        key : hashable, optional
+            When provided, only evict this value. Defaults to evicting all.
+
+        Returns
+        -------
+        evicted : int
+            Number of evicted values
+        """
+
+        with self._lock:
+
+            if key is None:
+                evicted = len(self._data)
+                self._data.clear()
+                self.nbytes = 0
+
+            elif key in self._data:
+                self._remove(key)
+                evicted = 1
+
+            else:
+                evicted = 0
+
+            self.evictions += evicted
+
+        return evicted
+
+    def stats(self):
+        """Cache statistics (entries, bytes, hits, misses, evictions)"""
+
+        with self._lock:
+            return {'entries': len(self._data),
+                    'bytes': self.nbytes,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+# monotonic clock, when available (Python 3.3+)
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class NegativeCache(object):
+    """Keys known to be unavailable, each forgotten after `ttl` seconds
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Time to live, in seconds. Defaults to keeping keys forever.
+    """
+
+    def __init__(self, ttl=None):
+        super(NegativeCache, self).__init__()
+        self.ttl = ttl
+        # key --> (expiration time, reason)
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.reason(key) is not None
+
+    def add(self, key, reason=''):
+        """Mark `key` as unavailable
+
+        Parameters
+        ----------
+        key : hashable
+        reason : str or Exception, optional
+            Why `key` is unavailable.
+        """
+
+        expires = None if self.ttl is None else _clock() + self.ttl
+        with self._lock:
+            self._data[key] = (expires, reason)
+
+    def reason(self, key):
+        """Why `key` is unavailable (None if it is not known to be)"""
+
+        with self._lock:
+
+            try:
+                expires, reason = self._data[key]
+            except KeyError:
+                return None
+
+            if expires is not None and _clock() > expires:
+                del self._data[key]
+                return None
+
+            return reason
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Plugin configuration (tvd.yml) loading
+
+YAML parsing is the main cost of instantiating a plugin whose configuration
+lists thousands of resource URLs. Parsed configurations are therefore
+cached, both in memory and on disk (in compact `marshal` format), keyed by
+path, modification time and size of the YAML file.
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sys
+import yaml
+import hashlib
+import marshal
+import threading
+
+from ..core.util import atomic_write
+from .registry import default_cache_dir
+
+# C implementation (libyaml) when available
+try:
+    YAMLLoader = yaml.CSafeLoader
+except AttributeError:
+    YAMLLoader = yaml.SafeLoader
+
+# path --> (key, marshalled configuration)
+_CONFIGS = {}
+_CONFIGS_LOCK = threading.Lock()
+
+
+def _key(path):
+    """Identify version of configuration file (and of this interpreter)"""
+    stat = os.stat(path)
+    return [path, stat.st_mtime, stat.st_size,
+            marshal.version, list(sys.version_info[:2])]
+
+
+def _path_to_cache(path, cache_dir):
+    digest = hashlib.sha1(path.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, 'config', digest + '.marshal')
+
+
+def _read_cache(cache, key):
+    """Marshalled configuration from cache (None if missing or outdated)"""
+
+    try:
+        with open(cache, 'rb') as f:
+            cached_key, data = marshal.load(f)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+    return data if cached_key == key else None
+
+
+def _write_cache(cache, key, data):
+
+    # cache is an optimization: never fail because of it
+    try:
+        directory = os.path.dirname(cache)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with atomic_write(cache, mode='wb') as f:
+            marshal.dump((key, data), f)
+    except (IOError, OSError):
+        pass
+
+
+def load_config(path, cache_dir=None):
+    """Load YAML configuration file
+
+    Parameters
+    ----------
+    path : str
+        Path to YAML file (e.g. tvd.yml).
+    cache_dir : str, optional
+        Where to cache parsed configuration. Defaults to $TVD_CACHE_DIR
+        (see `tvd.plugin.registry.default_cache_dir`). Use False to disable
+        on-disk caching.
+
+    Returns
+    -------
+    config : dict
+        Parsed configuration. Each call returns a new copy.
+    """
+
+    path = os.path.abspath(path)
+    key = _key(path)
+
+    with _CONFIGS_LOCK:
+        cached_key, data = _CONFIGS.get(path, (None, None))
+
+    if cached_key != key:
+
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache = _path_to_cache(path, cache_dir) if cache_dir else None
+
+        data = _read_cache(cache, key) if cache else None
+
+        if data is None:
+
+            with open(path, mode='r') as f:
+                config = yaml.load(f, Loader=YAMLLoader)
+
+            try:
+                data = marshal.dumps(config)
+            except ValueError:
+                # e.g. YAML timestamps
+                return config
+
+            if cache:
+                _write_cache(cache, key, data)
+
+        with _CONFIGS_LOCK:
+            _CONFIGS[path] = (key, data)
+
+    return marshal.loads(data)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Thread-local drifting times
+
+pyannote.core draws labels of drifting times (`T()`) from one generator
+shared by the whole process, and `T.reset()` restarts it for everyone: two
+threads building transcriptions at the same time would get interleaved
+labels, or have them reset under their feet.
+
+`drifting_namespace()` gives the current thread its own label generator,
+restarted from 'A' for the duration of the block.
+"""
+
+from __future__ import unicode_literals
+
+import threading
+import contextlib
+from pyannote.core import T
+
+try:
+    from pyannote.core.time import _TDrifting, _t_iter
+except ImportError:
+    _TDrifting = None
+
+
+class _ThreadLocalLabels(object):
+    """Drop-in replacement for the process-wide label generator"""
+
+    def __init__(self):
+        super(_ThreadLocalLabels, self).__init__()
+        self._local = threading.local()
+
+    def swap(self, labels):
+        """Replace labels generator of current thread and return previous"""
+        previous = getattr(self._local, 'labels', None)
+        self._local.labels = labels
+        return previous
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        labels = getattr(self._local, 'labels', None)
+        if labels is None:
+            labels = _t_iter()
+            self._local.labels = labels
+        return next(labels)
+
+    # Python 2
+    next = __next__
+
+
+_LABELS = _ThreadLocalLabels() if _TDrifting is not None else None
+_LOCK = threading.RLock()
+
+
+def _install():
+    """Plug thread-local labels into pyannote.core
+
+    Returns
+    -------
+    success : bool
+        False if pyannote.core internals are not the expected ones.
+    """
+
+    if _LABELS is None or not hasattr(_TDrifting, '_TDrifting__t_iter'):
+        return False
+
+    # T.reset() puts a plain generator back in place
+    if _TDrifting._TDrifting__t_iter is not _LABELS:
+        with _LOCK:
+            _TDrifting._TDrifting__t_iter = _LABELS
+
+    return True
+
+
+@contextlib.contextmanager
+def drifting_namespace():
+    """Fresh drifting time labels for the current thread
+
+    Usage
+    -----
+    >>> with drifting_namespace():
+    ...     transcription = plugin_method(**params)   # T() -> 'A', 'B', ...
+
+    Falls back to a process-wide lock and `T.reset()` when pyannote.core
+    internals cannot be patched.
+    """
+
+    if _install():
+        previous = _LABELS.swap(_t_iter())
+        try:
+            yield
+        finally:
+            _LABELS.swap(previous)
+
+    else:
+        with _LOCK:
+            T.reset()
+            yield
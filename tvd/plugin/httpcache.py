@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+from __future__ import unicode_literals
+
+import os
+import hashlib
+import logging
+import simplejson as json
+
+from ..core.util import atomic_write
+
+HTTP_CACHE_URL = 'url'
+HTTP_CACHE_ETAG = 'etag'
+HTTP_CACHE_LAST_MODIFIED = 'last_modified'
+
+
+class HTTPCache(object):
+    """On-disk HTTP response cache
+
+    Raw response bodies are stored along with their ETag and Last-Modified
+    headers so that they can later be revalidated using conditional requests.
+
+    Parameters
+    ----------
+    root : str
+        Path to cache directory (created if needed).
+    """
+
+    def __init__(self, root):
+        super(HTTPCache, self).__init__()
+        self.root = root
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        prefix = os.path.join(self.root, key[:2], key)
+        return prefix + '.body', prefix + '.json'
+
+    def get(self, url):
+        """Get cached response
+
+        Returns
+        -------
+        body : bytes
+            Raw response body
+        meta : dict
+            Response validators (ETag and Last-Modified)
+        None if `url` is not cached.
+        """
+
+        body_path, meta_path = self._paths(url)
+
+        # metadata file is written last: it marks a complete entry
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+        return body, meta
+
+    def set(self, url, body, headers):
+        """Store response
+
+        Parameters
+        ----------
+        url : str
+        body : bytes
+            Raw response body
+        headers : dict-like
+            Response headers
+        """
+
+        body_path, meta_path = self._paths(url)
+
+        meta = {HTTP_CACHE_URL: url,
+                HTTP_CACHE_ETAG: headers.get('ETag', None),
+                HTTP_CACHE_LAST_MODIFIED: headers.get('Last-Modified', None)}
+
+        # cache is an optimization: never fail (a download) because of it
+        try:
+            directory = os.path.dirname(body_path)
+            if not os.path.isdir(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:
+                    # might have been created concurrently
+                    if not os.path.isdir(directory):
+                        raise
+
+            # metadata file is written last: it marks a complete entry
+            with atomic_write(body_path, mode='wb') as f:
+                f.write(body)
+            with atomic_write(meta_path) as f:
+                json.dump(meta, f)
+
+        except (IOError, OSError) as e:
+            msg = 'could not cache {url}: {e}'
+            logging.warning(msg.format(url=url, e=e))
+
+    def conditional_headers(self, meta):
+        """HTTP headers for revalidating a cached response"""
+
+        headers = {}
+
+        etag = meta.get(HTTP_CACHE_ETAG, None)
+        if etag:
+            headers['If-None-Match'] = etag
+
+        last_modified = meta.get(HTTP_CACHE_LAST_MODIFIED, None)
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        return headers
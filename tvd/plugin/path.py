@@ -30,8 +30,15 @@
 from __future__ import unicode_literals
 
 
+# supported resource file compression (see PathMixin.path_to_resource)
+RESOURCE_COMPRESSIONS = (None, 'gz', 'xz')
+
+
 class PathMixin(object):
 
+    # compression of resource files written to disk
+    RESOURCE_COMPRESSION = None
+
     def path_to_dump(self, season, disc):
 
         pattern = (
@@ -119,13 +126,47 @@ class PathMixin(object):
             format=format
         )
 
-    def path_to_resource(self, episode, resource):
+    def path_to_resource(self, episode, resource, compression=False):
+        """
+        Parameters
+        ----------
+        compression : {None, 'gz', 'xz'}, optional
+            Defaults to RESOURCE_COMPRESSION (i.e. uncompressed JSON)
+        """
+
+        if compression is False:
+            compression = self.RESOURCE_COMPRESSION
+
+        assert compression in RESOURCE_COMPRESSIONS
 
         pattern = (
             '{tvd}/{series}/metadata/{resource}/'
             '{series}.Season{season:02d}.Episode{episode:02d}.json'
         )
 
+        if compression:
+            pattern += '.{compression}'
+
+        return pattern.format(
+            tvd=self.tvd_dir,
+            series=episode.series,
+            resource=resource,
+            season=episode.season,
+            episode=episode.episode,
+            compression=compression
+        )
+
+    def path_to_binary_resource(self, episode, resource):
+        """Path to binary (columnar) version of resource
+
+        See `tvd.core.binary`.
+        """
+
+        pattern = (
+            '{tvd}/{series}/metadata/{resource}/'
+            '{series}.Season{season:02d}.Episode{episode:02d}.npz'
+        )
+
         return pattern.format(
             tvd=self.tvd_dir,
             series=episode.series,
@@ -133,3 +174,46 @@ class PathMixin(object):
             season=episode.season,
             episode=episode.episode
         )
+
+    def path_to_pack(self):
+        """Path to pack consolidating all resources of the series
+
+        See `tvd.core.pack`.
+        """
+
+        pattern = '{tvd}/{series}/metadata/{series}.pack'
+
+        return pattern.format(
+            tvd=self.tvd_dir,
+            series=self.__class__.__name__
+        )
+
+    def path_to_manifest(self):
+        """Path to manifest of resources stored on disk
+
+        See `tvd.core.manifest`.
+        """
+
+        pattern = '{tvd}/{series}/metadata/manifest.json'
+
+        return pattern.format(
+            tvd=self.tvd_dir,
+            series=self.__class__.__name__
+        )
+
+    def path_to_store(self):
+        """Path to SQLite resource store (shared by all series)
+
+        See `tvd.core.store`.
+        """
+
+        pattern = '{tvd}/tvd.sqlite'
+
+        return pattern.format(tvd=self.tvd_dir)
+
+    def path_to_http_cache(self):
+        """Path to on-disk HTTP response cache (shared by all series)"""
+
+        pattern = '{tvd}/cache/http'
+
+        return pattern.format(tvd=self.tvd_dir)
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Registry of installed series plugins
+
+Series plugins are declared as 'tvd.series' entry points. Only their names
+are read when the registry is first used: a plugin (and its HTML parsing
+dependencies) is imported the first time it is actually requested.
+
+Entry points are read with importlib.metadata (rather than pkg_resources,
+whose import alone scans every installed distribution) and cached on disk,
+until one of the sys.path directories is modified (e.g. when a package is
+installed or removed).
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sys
+import threading
+import importlib
+import simplejson as json
+from concurrent.futures import Future
+
+from ..core.util import atomic_write
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:
+    # Python < 3.8
+    from importlib_metadata import entry_points
+
+try:
+    from importlib.resources import files as _package_files
+except ImportError:
+    # Python < 3.9
+    _package_files = None
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # Python 2
+    from collections import Mapping
+
+TVD_SERIES_ENTRY_POINT = 'tvd.series'
+
+REGISTRY_SIGNATURE = 'signature'
+REGISTRY_ENTRY_POINTS = 'entry_points'
+
+
+def default_cache_dir():
+    """Directory for TVD caches that are not tied to a TVD root directory
+
+    $TVD_CACHE_DIR, defaults to $XDG_CACHE_HOME/tvd (i.e. ~/.cache/tvd).
+    """
+
+    directory = os.environ.get('TVD_CACHE_DIR', None)
+    if directory is None:
+        directory = os.path.join(
+            os.environ.get('XDG_CACHE_HOME',
+                           os.path.join(os.path.expanduser('~'), '.cache')),
+            'tvd')
+    return directory
+
+
+def default_cache_path():
+    """Default path to on-disk registry cache ($TVD_CACHE_DIR/series.json)"""
+    return os.path.join(default_cache_dir(), 'series.json')
+
+
+def resource_filename(package, resource):
+    """Path to `resource` file shipped with `package`
+
+    Same as pkg_resources.resource_filename, for packages installed as
+    regular directories.
+    """
+
+    if _package_files is not None:
+        return str(_package_files(package).joinpath(resource))
+
+    module = importlib.import_module(package)
+    return os.path.join(os.path.dirname(module.__file__), resource)
+
+
+def _signature():
+    """Summary of sys.path directories and their modification times"""
+
+    signature = [sys.version]
+    for directory in sys.path:
+        # current working directory would change all the time
+        if not directory:
+            continue
+        try:
+            signature.append([directory, os.stat(directory).st_mtime])
+        except OSError:
+            continue
+    return signature
+
+
+def _load(value):
+    """Load object from entry point value (e.g. 'package.module:attr')"""
+
+    module, _, attributes = value.partition(':')
+    obj = importlib.import_module(module.strip())
+    for attribute in attributes.strip().split('.') if attributes else []:
+        obj = getattr(obj, attribute)
+    return obj
+
+
+class SeriesPlugins(Mapping):
+    """Lazy {series name: plugin class} mapping
+
+    Parameters
+    ----------
+    group : str, optional
+        Entry point group. Defaults to 'tvd.series'.
+    cache : str, optional
+        Path to on-disk registry cache. Defaults to `default_cache_path()`.
+        Use False to disable on-disk caching.
+    """
+
+    def __init__(self, group=TVD_SERIES_ENTRY_POINT, cache=None):
+        super(SeriesPlugins, self).__init__()
+        self.group = group
+        self.cache = default_cache_path() if cache is None else cache
+        # series name --> entry point value (read once, on first use)
+        self._entry_points = None
+        # series name --> plugin class (loaded on first access)
+        self._plugins = {}
+        # (series name, TVD root) --> Future of shared plugin instance
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def _read_cache(self, signature):
+        """Cached entry points (None if missing or outdated)"""
+
+        if not self.cache:
+            return None
+
+        try:
+            with open(self.cache, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if data.get(REGISTRY_SIGNATURE, None) != signature:
+            return None
+
+        return data[REGISTRY_ENTRY_POINTS].get(self.group, None)
+
+    def _write_cache(self, signature, entry_points):
+
+        if not self.cache:
+            return
+
+        data = {REGISTRY_SIGNATURE: signature,
+                REGISTRY_ENTRY_POINTS: {}}
+
+        # keep other groups, as long as they are up to date
+        try:
+            with open(self.cache, 'r') as f:
+                previous = json.load(f)
+            if previous.get(REGISTRY_SIGNATURE, None) == signature:
+                data = previous
+        except (IOError, OSError, ValueError):
+            pass
+
+        data[REGISTRY_ENTRY_POINTS][self.group] = entry_points
+
+        # cache is an optimization: never fail because of it
+        try:
+            directory = os.path.dirname(self.cache)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            with atomic_write(self.cache) as f:
+                json.dump(data, f)
+        except (IOError, OSError):
+            pass
+
+    def _scan(self):
+        """Read entry points from installed distributions"""
+
+        found = entry_points()
+        if hasattr(found, 'select'):
+            found = found.select(group=self.group)
+        else:
+            # Python 3.8 and 3.9
+            found = found.get(self.group, [])
+
+        return dict((o.name, o.value) for o in found)
+
+    def _get_entry_points(self):
+
+        with self._lock:
+
+            if self._entry_points is None:
+
+                signature = _signature()
+                entry_points = self._read_cache(signature)
+
+                if entry_points is None:
+                    entry_points = self._scan()
+                    self._write_cache(signature, entry_points)
+
+                self._entry_points = entry_points
+
+            return self._entry_points
+
+    def names(self):
+        """Names of installed series plugins (none of them is imported)"""
+        return sorted(self._get_entry_points())
+
+    def is_loaded(self, series):
+        """Whether plugin `series` has already been imported"""
+        return series in self._plugins
+
+    def __getitem__(self, series):
+
+        with self._lock:
+
+            if series not in self._plugins:
+                value = self._get_entry_points()[series]
+                self._plugins[series] = _load(value)
+
+            return self._plugins[series]
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self._get_entry_points())
+
+    def __contains__(self, series):
+        return series in self._get_entry_points()
+
+    def __repr__(self):
+        return '<SeriesPlugins: {names}>'.format(
+            names=', '.join(self.names()))
+
+    def refresh(self):
+        """Forget entry points (e.g. after installing a new plugin)"""
+        with self._lock:
+            self._entry_points = None
+            self._plugins = {}
+
+    def instance(self, series, root, acknowledgment=True):
+        """Get plugin instance shared by the whole process
+
+        Instantiating a plugin means reading its configuration and building
+        its resource registry: use this method rather than the plugin class
+        to share one instance (and the resources it has already loaded)
+        between all users of `series` in `root`. Plugin instances can be
+        used from several threads. Concurrent requests for the same instance
+        wait for it to be created, without blocking other series.
+
+        Parameters
+        ----------
+        series : str
+            Series name (e.g. 'TheBigBangTheory').
+        root : str
+            Path to TVD root directory.
+        acknowledgment : bool, optional
+            Only used when the instance is created.
+
+        Returns
+        -------
+        plugin : Plugin
+
+        Raises
+        ------
+        KeyError
+            If plugin `series` is not installed.
+        """
+
+        key = (series, os.path.abspath(root))
+
+        with self._lock:
+            future = self._instances.get(key, None)
+            create = future is None
+            if create:
+                future = Future()
+                self._instances[key] = future
+
+        # someone else is (or was) creating it
+        if not create:
+            return future.result()
+
+        try:
+            plugin = self[series](root, acknowledgment=acknowledgment)
+
+        # failed instantiations are not remembered
+        except Exception as e:
+            with self._lock:
+                if self._instances.get(key, None) is future:
+                    del self._instances[key]
+            future.set_exception(e)
+            raise
+
+        future.set_result(plugin)
+        return plugin
+
+    def clear_instances(self, series=None, root=None):
+        """Forget shared plugin instances (see `instance`)
+
+        Parameters
+        ----------
+        series : str, optional
+            Only forget instances of this series.
+        root : str, optional
+            Only forget instances for this TVD root directory.
+        """
+
+        if root is not None:
+            root = os.path.abspath(root)
+
+        with self._lock:
+            for _series, _root in list(self._instances):
+                if series is not None and _series != series:
+                    continue
+                if root is not None and _root != root:
+                    continue
+                del self._instances[_series, _root]
@@ -29,13 +29,37 @@
 
 from __future__ import unicode_literals
 
+import os
+import sys
 import six
+import struct
+import hashlib
 import logging
+import threading
+import collections
 import requests
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import Future, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..core import Episode
 from ..core.json import load as load_json
-from pyannote.core import T
-import sys
+from ..core.json import dump as dump_json
+from ..core.json import loads as loads_json
+from ..core import binary
+from ..core.pack import PackWriter, open_pack, forget_pack
+from ..core.store import open_store
+from ..core.manifest import Manifest
+from ..core.manifest import MANIFEST_EPISODE, MANIFEST_RESOURCE
+from ..core.manifest import MANIFEST_PATH, MANIFEST_BINARY
+from ..core.manifest import MANIFEST_FINGERPRINT, MANIFEST_MTIME
+from .httpcache import HTTPCache
+from .cache import ResourceCache
+from .cache import NegativeCache
+from .cache import _clock
+from .path import RESOURCE_COMPRESSIONS
+from .drifting import drifting_namespace
+import simplejson as json
 
 
 TVD_RESOURCE_URL = 'url'
@@ -49,13 +73,233 @@ IN CASE YOU USE '{resource}' RESOURCES, PLEASE CONSIDER CITING:
 """
 
 
+def load_resource(path, episode=None, resource_type=None):
+    """Load resource from disk, in JSON, binary, packed or SQLite format
+
+    `episode` and `resource_type` are only needed for packs and stores.
+    """
+
+    if path.endswith('.pack'):
+        return open_pack(path).load(episode, resource_type)
+
+    if path.endswith('.sqlite'):
+        return open_store(path).load(episode, resource_type)
+
+    if path.endswith('.npz'):
+        return binary.load(path)
+
+    return load_json(path)
+
+
+# (plugin class, TVD root) --> plugin instance
+# one per worker process, so that each worker only loads YAML config once
+_WORKER_PLUGINS = {}
+
+
+def build_resource(plugin_class, tvd_dir, resource_type, episode):
+    """Get resource from plugin, in a worker process
+
+    Parameters
+    ----------
+    plugin_class : type
+        Series plugin class, instantiated once per worker process.
+    tvd_dir : str
+        Path to TVD root directory.
+    resource_type : str
+    episode : Episode
+
+    Returns
+    -------
+    data : str
+        JSON-encoded resource, so that plugin results do not need to be
+        picklable (see `tvd.core.json.loads`).
+    """
+
+    key = (plugin_class, tvd_dir)
+    if key not in _WORKER_PLUGINS:
+        _WORKER_PLUGINS[key] = plugin_class(tvd_dir, acknowledgment=False)
+    plugin = _WORKER_PLUGINS[key]
+
+    resource = plugin._resource(resource_type, episode)
+
+    with drifting_namespace():
+        result = resource.method(**resource.params)
+
+    return json.dumps(result, for_json=True, allow_nan=True)
+
+
+def _intern(name):
+    """Intern resource type name"""
+    try:
+        return six.moves.intern(name)
+    except TypeError:
+        # Python 2 only interns byte strings
+        return name
+
+
+class ResourceKind(object):
+    """What all resources of a given type have in common
+
+    Parameters
+    ----------
+    name : str
+        Resource type (e.g. 'transcript').
+    method : callable
+        Plugin method used to obtain resources of this type.
+    source : str, optional
+        Resource 'source', from YAML configuration.
+    data_type : str, optional
+        Resource 'type', from YAML configuration.
+    """
+
+    __slots__ = ('name', 'method', 'source', 'type')
+
+    def __init__(self, name, method, source=None, data_type=None):
+        super(ResourceKind, self).__init__()
+        self.name = name
+        self.method = method
+        self.source = source
+        self.type = data_type
+
+
+class ResourceRow(object):
+    """Resource registry entry (see ResourceMixin.resources)
+
+    Only the URL is stored for each resource: everything else is shared
+    with other resources of the same type (see ResourceKind), and parameters
+    passed to the plugin method are only built when requested.
+
+    For backward compatibility, row['method'], row['params'] and
+    row['type'] are also supported.
+
+    Parameters
+    ----------
+    kind : ResourceKind
+    episode : Episode
+    url : str
+    """
+
+    __slots__ = ('kind', 'episode', 'url')
+
+    def __init__(self, kind, episode, url):
+        super(ResourceRow, self).__init__()
+        self.kind = kind
+        self.episode = episode
+        self.url = url
+
+    @property
+    def method(self):
+        """Method to call to get the resource"""
+        return self.kind.method
+
+    @property
+    def source(self):
+        return self.kind.source
+
+    @property
+    def type(self):
+        """Data type (transcription, annotation, else ?)"""
+        return self.kind.type
+
+    @property
+    def params(self):
+        """Parameters to pass to method to get the resource"""
+        return {'url': self.url,
+                'source': self.kind.source,
+                'episode': self.episode}
+
+    def __getitem__(self, key):
+        if key not in ('method', 'params', 'type'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        return '<ResourceRow: {t} for {e!s}>'.format(t=self.kind.name,
+                                                     e=self.episode)
+
+
 class ResourceMixin(object):
 
+    # size of HTTP connection pool (per host)
+    HTTP_POOL_SIZE = 10
+    # number of retries on connection errors, timeouts and 5xx responses
+    HTTP_MAX_RETRIES = 5
+    # exponential backoff between retries (0.5s, 1s, 2s, 4s, ...)
+    HTTP_BACKOFF_FACTOR = 0.5
+    # HTTP status codes triggering a retry
+    HTTP_RETRY_STATUS = (500, 502, 503, 504)
+    # connection and read timeout (in seconds)
+    HTTP_TIMEOUT = 30.
+    # whether to cache HTTP responses on disk (see path_to_http_cache)
+    HTTP_CACHE = True
+    # number of recently downloaded pages kept in memory (0 = none)
+    # (see download_as_utf8 and forget_downloads)
+    HTTP_MEMOIZE = 32
+    # how long (in seconds) they are kept
+    HTTP_MEMOIZE_TTL = 60.
+
+    # maximum number of resources kept in memory (None = no limit)
+    CACHE_MAX_ENTRIES = None
+    # approximate memory budget for resources kept in memory (None = no limit)
+    CACHE_MAX_BYTES = None
+    # whether to also save resources in binary format (see tvd.core.binary)
+    RESOURCE_BINARY = False
+    # whether to record saved resources in series manifest
+    RESOURCE_MANIFEST = True
+    # save manifest once every that many saved resources (see flush_manifest)
+    MANIFEST_FLUSH_EVERY = 100
+    # whether to also save resources in TVD SQLite store (see tvd.core.store)
+    RESOURCE_STORE = False
+
+    # how long (in seconds) missing or failed resources are remembered
+    NEGATIVE_CACHE_TTL = 600.
+
+    # resource status, as returned by `resource_status`
+    RESOURCE_IN_MEMORY = 'memory'
+    RESOURCE_ON_DISK = 'disk'
+    RESOURCE_FAILED = 'failed'
+    # resource obtained from plugin (see `_get_resource`)
+    RESOURCE_FROM_PLUGIN = 'plugin'
+
     def init_resource(self, resources):
 
+        # shared HTTP session used by download_as_utf8
+        self.init_session()
+
+        # on-disk HTTP response cache used by download_as_utf8
+        self.init_http_cache()
+
+        # url --> Future, for downloads in progress
+        # url --> (expiration time, text), for HTTP_MEMOIZE most recent ones
+        # (see download_as_utf8)
+        self._downloads = {}
+        self._downloads_lock = threading.Lock()
+        self._pages = ResourceCache(max_entries=self.HTTP_MEMOIZE)
+
+        # protects self.resources, so that plugin methods can run concurrently
+        # (drifting time labels are taken care of by drifting_namespace)
+        self._resources_lock = threading.RLock()
+
+        # in-memory cache of loaded resources
+        self.init_cache()
+
+        # (episode, resource_type) --> path, for resources known to be on disk
+        self._on_disk = {}
+        # ('disk' or 'plugin', episode, resource_type) known to be missing
+        self.unavailable = NegativeCache(ttl=self.NEGATIVE_CACHE_TTL)
+
+        # resources stored on disk (with size, hash, source URL, etc.)
+        self.manifest = Manifest(self.path_to_manifest(), self.tvd_dir,
+                                 flush_every=self.MANIFEST_FLUSH_EVERY)
+
         # initialize web resources data structure
         # resources[episode] contains all resources for a given episode
-        self.resources = {}
+        # resources[episode][resource_type] is a (compact) ResourceRow
+        registry = {}
+
+        # (season, episode) --> Episode, shared by all its resources
+        episodes = {}
+        series = self.__class__.__name__
 
         # loop on web resources described in 'resources' section
         for resource_type, resource in six.iteritems(resources):
@@ -64,14 +308,15 @@ class ResourceMixin(object):
                 sys.stdout.write(TVD_ACKNOWLEDGEMENT.format(
                     resource=resource_type, reference=resource['source']))
 
-            # obtain corresponding 'get_resource' method
-            resource_method = self._get_resource_method(resource_type)
-
-            # read resource 'source' from YAML configuration when provided
-            source = resource.get(TVD_RESOURCE_SOURCE, None)
-
-            # read resource 'type' from YAML configuration when provided
-            data_type = resource.get(TVD_RESOURCE_TYPE, None)
+            # what all resources of this type have in common
+            kind = ResourceKind(
+                _intern(resource_type),
+                # obtain corresponding 'get_resource' method
+                self._get_resource_method(resource_type),
+                # read resource 'source' from YAML configuration when provided
+                source=resource.get(TVD_RESOURCE_SOURCE, None),
+                # read resource 'type' from YAML configuration when provided
+                data_type=resource.get(TVD_RESOURCE_TYPE, None))
 
             # loop on all provided URLs
             # NB: some episodes might not have some resources
@@ -79,33 +324,163 @@ class ResourceMixin(object):
 
                 season_number = url[TVD_RESOURCE_SEASON]
                 episode_number = url[TVD_RESOURCE_EPISODE]
-                episode = Episode(
-                    series=self.__class__.__name__,
-                    season=season_number,
-                    episode=episode_number
-                )
 
                 # add episode to resource main structure
                 # in case it is the first time it is encountered
-                if episode not in self.resources:
-                    self.resources[episode] = {}
-
-                # initialize resource placeholder
-                self.resources[episode][resource_type] = {
-                    # method to call to get the resource
-                    'method': resource_method,
-                    # parameters to pass to method to get the resource
-                    'params': {
-                        'url': url[TVD_RESOURCE_URL],
-                        'source': source,
-                        'episode': episode
-                    },
-                    # results of call "method(**params)"
-                    # NB: it is set to None until we actually get this resource
-                    'result': None,
-                    # data type (transcription, annotation, else ?)
-                    'type': data_type
-                }
+                episode = episodes.get((season_number, episode_number), None)
+                if episode is None:
+                    episode = Episode(
+                        series=series,
+                        season=season_number,
+                        episode=episode_number
+                    )
+                    episodes[season_number, episode_number] = episode
+                    registry[episode] = {}
+
+                registry[episode][kind.name] = ResourceRow(
+                    kind, episode, url[TVD_RESOURCE_URL])
+
+        with self._resources_lock:
+            self.resources = registry
+
+    def _resource(self, resource_type, episode):
+        """Get resource description from self.resources (thread-safe)
+
+        Raises
+        ------
+        KeyError
+            If `resource_type` is not provided for `episode`
+        """
+
+        with self._resources_lock:
+            return self.resources[episode][resource_type]
+
+    def init_session(self, pool_size=None, max_retries=None,
+                     backoff_factor=None, timeout=None):
+        """Initialize HTTP session shared by all downloads of this plugin
+
+        Connections are kept alive and pooled so that consecutive downloads
+        from the same host reuse them. Failed requests (connection errors,
+        timeouts and 5xx responses) are retried with exponential backoff.
+
+        Parameters
+        ----------
+        pool_size : int, optional
+            Maximum number of pooled connections per host.
+            Defaults to HTTP_POOL_SIZE.
+        max_retries : int, optional
+            Defaults to HTTP_MAX_RETRIES.
+        backoff_factor : float, optional
+            Defaults to HTTP_BACKOFF_FACTOR.
+        timeout : float, optional
+            Connection and read timeout, in seconds. Defaults to HTTP_TIMEOUT.
+        """
+
+        if pool_size is None:
+            pool_size = self.HTTP_POOL_SIZE
+
+        if max_retries is None:
+            max_retries = self.HTTP_MAX_RETRIES
+
+        if backoff_factor is None:
+            backoff_factor = self.HTTP_BACKOFF_FACTOR
+
+        if timeout is None:
+            timeout = self.HTTP_TIMEOUT
+
+        retry = Retry(total=max_retries,
+                      backoff_factor=backoff_factor,
+                      status_forcelist=self.HTTP_RETRY_STATUS)
+
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size,
+                              max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # request URL content with dummy user-agent
+        self.session.headers.update({'User-agent': 'TVD'})
+
+        self.http_timeout = timeout
+
+    def init_http_cache(self, enabled=None, offline=False):
+        """Initialize on-disk HTTP response cache
+
+        Cached responses are revalidated with conditional requests
+        (If-None-Match/If-Modified-Since) and reused when the server answers
+        "304 Not Modified" or cannot be reached.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Defaults to HTTP_CACHE.
+        offline : bool, optional
+            When True, serve cached responses without contacting the server.
+            Only URLs missing from the cache are actually downloaded.
+        """
+
+        if enabled is None:
+            enabled = self.HTTP_CACHE
+
+        if enabled:
+            self.http_cache = HTTPCache(self.path_to_http_cache())
+        else:
+            self.http_cache = None
+
+        self.http_offline = offline
+
+    def init_cache(self, cache=None, max_entries=None, max_bytes=None):
+        """Initialize in-memory cache of loaded resources
+
+        Parameters
+        ----------
+        cache : object, optional
+            Custom cache implementing `get`, `set`, `evict` and `__contains__`
+            (see `ResourceCache`). Defaults to a LRU `ResourceCache`.
+        max_entries : int, optional
+            Defaults to CACHE_MAX_ENTRIES.
+        max_bytes : int, optional
+            Defaults to CACHE_MAX_BYTES.
+        """
+
+        if cache is None:
+
+            if max_entries is None:
+                max_entries = self.CACHE_MAX_ENTRIES
+
+            if max_bytes is None:
+                max_bytes = self.CACHE_MAX_BYTES
+
+            cache = ResourceCache(max_entries=max_entries,
+                                  max_bytes=max_bytes)
+
+        self.cache = cache
+
+    def evict_resources(self, resource_type=None, episode=None):
+        """Remove resources from memory
+
+        Parameters
+        ----------
+        resource_type : str, optional
+            When provided, only evict this resource type
+        episode : `tvd.Episode`, optional
+            When provided, only evict resources for this episode
+
+        Returns
+        -------
+        evicted : int
+            Number of evicted resources
+        """
+
+        evicted = 0
+        for _episode, _resource_type in self.iter_resources(
+            resource_type=resource_type, episode=episode, data=False
+        ):
+            evicted += self.cache.evict((_episode, _resource_type))
+
+        return evicted
 
     def _get_resource_method(self, resource_type):
         """Get method for given resource
@@ -142,7 +517,8 @@ class ResourceMixin(object):
         episode : `tvd.Episode`
         """
 
-        resources = self.resources.get(episode, None)
+        with self._resources_lock:
+            resources = self.resources.get(episode, None)
         if resources is None:
             return False
 
@@ -152,6 +528,472 @@ class ResourceMixin(object):
 
         return True
 
+    def in_memory(self, resource_type, episode):
+        """Checks whether resource is currently loaded in memory"""
+        return (episode, resource_type) in self.cache
+
+    def on_disk(self, resource_type, episode):
+        """Checks whether resource is available on disk
+
+        Series pack (unless resource was saved after the pack was created),
+        SQLite store and manifest are looked up first. Otherwise, result is
+        remembered: the file system is only checked once (or once every
+        NEGATIVE_CACHE_TTL seconds for missing resources).
+        """
+
+        key = (episode, resource_type)
+
+        if key in self._on_disk:
+            return True
+
+        if ('disk', episode, resource_type) in self.unavailable:
+            return False
+
+        # look into series pack first (in-memory index look-up)
+        pack = open_pack(self.path_to_pack())
+        if pack is not None and key in pack:
+            # unless resource file was saved after pack was created
+            # (or at the same time, given file system time resolution)
+            entry = self.manifest.get(episode, resource_type)
+            if entry is None or entry[MANIFEST_MTIME] < pack.mtime:
+                self._on_disk[key] = pack.path
+                return True
+
+        # then into TVD SQLite store (indexed look-up)
+        store = open_store(self.path_to_store())
+        if store is not None and key in store:
+            self._on_disk[key] = store.path
+            return True
+
+        path = self._path_to_resource_file(resource_type, episode)
+        if path is not None:
+            self._on_disk[key] = path
+            return True
+
+        path = self.path_to_resource(episode, resource_type)
+        self.unavailable.add(('disk', episode, resource_type),
+                             reason='{p} does not exist'.format(p=path))
+        return False
+
+    def _path_to_resource_file(self, resource_type, episode):
+        """Path to individual resource file (None if there is none)
+
+        Unlike `on_disk`, neither pack nor SQLite store are looked up.
+        """
+
+        # series manifest (in-memory look-up)
+        # unless file was removed since it was saved
+        entry = self.manifest.get(episode, resource_type)
+        if entry is not None:
+            path = self.manifest.absolute(
+                entry.get(MANIFEST_BINARY, entry[MANIFEST_PATH]))
+            if os.path.exists(path):
+                return path
+
+        # then for binary resource file (fastest to load)
+        # then for JSON resource file, with preferred compression first
+        compressions = [self.RESOURCE_COMPRESSION] + [
+            c for c in RESOURCE_COMPRESSIONS if c != self.RESOURCE_COMPRESSION]
+        paths = [self.path_to_binary_resource(episode, resource_type)] + [
+            self.path_to_resource(episode, resource_type,
+                                  compression=compression)
+            for compression in compressions]
+
+        for path in paths:
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    def _path_to_existing_resource(self, resource_type, episode):
+        """Path to resource file (or pack), whatever its format"""
+
+        if self.on_disk(resource_type, episode):
+            return self._on_disk[(episode, resource_type)]
+
+        return self.path_to_resource(episode, resource_type)
+
+    def _size_on_disk(self, path, resource_type, episode):
+        """Size of resource JSON encoding (cheap proxy for memory footprint)
+
+        Returns
+        -------
+        size : int or None
+            None when it cannot be obtained cheaply (.json.xz and .npz
+            files), in which case the cache estimates it on its own.
+        """
+
+        if path.endswith('.pack'):
+            return open_pack(path).size(episode, resource_type)
+
+        if path.endswith('.sqlite'):
+            return open_store(path).get_size(episode, resource_type)
+
+        if path.endswith('.json'):
+            return os.path.getsize(path)
+
+        # gzip trailer holds the uncompressed size (modulo 2^32)
+        if path.endswith('.gz'):
+            with open(path, 'rb') as f:
+                f.seek(-4, os.SEEK_END)
+                return struct.unpack('<I', f.read(4))[0]
+
+        # compressed size would grossly underestimate memory footprint
+        return None
+
+    def pack_resources(self):
+        """Consolidate all resources available on disk into one pack
+
+        Once packed, resources are loaded from the pack (see `path_to_pack`)
+        in preference to individual files. Resources saved afterwards are
+        loaded from their own file (as long as they are recorded in the
+        manifest), and only added to the pack the next time it is created.
+
+        The pack is always built from individual resource files, never from
+        a previous pack.
+
+        Returns
+        -------
+        packed : int
+            Number of packed resources
+        """
+
+        path = self.path_to_pack()
+
+        # create containing directory if needed
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        packed = 0
+
+        with PackWriter(path) as pack:
+
+            for episode, resource_type in self.iter_resources(data=False):
+
+                resource_path = self._path_to_resource_file(resource_type,
+                                                            episode)
+                if resource_path is None:
+                    continue
+
+                resource = load_resource(resource_path, episode=episode,
+                                         resource_type=resource_type)
+                pack.add(episode, resource_type, resource)
+                packed += 1
+
+        # make sure new pack is used from now on
+        forget_pack(path)
+        self._on_disk.clear()
+
+        return packed
+
+    def store_resources(self):
+        """Copy all resources available on disk into TVD SQLite store
+
+        Once stored, resources are loaded from the store (see `path_to_store`)
+        in preference to individual files. Resources saved afterwards are
+        added to the store as well. The store is filled from individual
+        resource files.
+
+        Returns
+        -------
+        stored : int
+            Number of stored resources
+        """
+
+        store = open_store(self.path_to_store(), create=True)
+
+        stored = []
+
+        def _resources():
+            for episode, resource_type in self.iter_resources(data=False):
+                path = self._path_to_resource_file(resource_type, episode)
+                if path is None:
+                    continue
+                resource = load_resource(path, episode=episode,
+                                         resource_type=resource_type)
+                stored.append((episode, resource_type))
+                yield episode, resource_type, resource
+
+        store.put_many(_resources())
+
+        # make sure store is used from now on
+        self._on_disk.clear()
+
+        return len(stored)
+
+    def stored_resources(self, resource_type=None, season=None):
+        """Resources of this series available in TVD SQLite store
+
+        Parameters
+        ----------
+        resource_type : str, optional
+            Only return episodes with this resource (e.g. all episodes with
+            a transcript).
+        season : int, optional
+            Only return resources for this season.
+
+        Returns
+        -------
+        resources : list
+            (episode, resource_type) list, in episode chronological order.
+        """
+
+        store = open_store(self.path_to_store())
+        if store is None:
+            return []
+
+        return store.query(self.__class__.__name__,
+                           resource_type=resource_type, season=season)
+
+    def resource_status(self, resource_type, episode):
+        """Get resource availability
+
+        Returns
+        -------
+        status : str or None
+            RESOURCE_IN_MEMORY if resource is loaded in memory,
+            RESOURCE_ON_DISK if it is available on disk,
+            RESOURCE_FAILED if plugin recently failed to provide it,
+            None if availability is unknown (i.e. plugin has to be called).
+        """
+
+        if self.in_memory(resource_type, episode):
+            return self.RESOURCE_IN_MEMORY
+
+        if self.on_disk(resource_type, episode):
+            return self.RESOURCE_ON_DISK
+
+        if ('plugin', episode, resource_type) in self.unavailable:
+            return self.RESOURCE_FAILED
+
+        return None
+
+    def save_resource(self, resource_type, episode, resource):
+        """Save resource to disk (in JSON format)
+
+        When RESOURCE_BINARY is True, Timeline, Annotation and Transcription
+        resources are also saved in binary format, next to the JSON file.
+
+        When RESOURCE_MANIFEST is True, resource is also recorded in the
+        series manifest, which is only saved to disk once every
+        MANIFEST_FLUSH_EVERY resources (see `flush_manifest`).
+
+        Parameters
+        ----------
+        resource_type : str
+        episode : Episode
+        resource : Timeline, Annotation or Transcription
+
+        Returns
+        -------
+        path : str
+            Path to saved resource
+        """
+
+        path = self.path_to_resource(episode, resource_type)
+
+        # create containing directory if needed
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # might have been created concurrently
+                if not os.path.isdir(directory):
+                    raise
+
+        dump_json(resource, path)
+
+        self._on_disk[(episode, resource_type)] = path
+
+        # binary file takes precedence over JSON file when loading:
+        # make sure it is either up to date or removed
+        binary_path = self.path_to_binary_resource(episode, resource_type)
+        if self.RESOURCE_BINARY and binary.supports(resource):
+            binary.dump(resource, binary_path)
+            self._on_disk[(episode, resource_type)] = binary_path
+        elif os.path.exists(binary_path):
+            os.remove(binary_path)
+
+        # store takes precedence over JSON file when loading:
+        # make sure it is up to date, if it exists
+        store = open_store(self.path_to_store(), create=self.RESOURCE_STORE)
+        if store is not None:
+            store.put(episode, resource_type, resource)
+
+        self.unavailable.discard(('disk', episode, resource_type))
+
+        if self.RESOURCE_MANIFEST:
+            self.manifest.update([self.manifest_entry(resource_type, episode,
+                                                      path=path)])
+
+        return path
+
+    def manifest_entry(self, resource_type, episode, path=None,
+                       adopted=False):
+        """Describe resource stored on disk, for the series manifest
+
+        Parameters
+        ----------
+        resource_type : str
+        episode : Episode
+        path : str, optional
+            Path to JSON resource file. Defaults to `path_to_resource`.
+        adopted : bool, optional
+            Set to True for resource files that were not just saved by this
+            plugin (e.g. saved before manifests were introduced). Their
+            fingerprint is unknown, so that `is_outdated` reports them.
+
+        Returns
+        -------
+        entry : dict
+            See `tvd.core.manifest.Manifest.make_entry`
+        """
+
+        if path is None:
+            path = self.path_to_resource(episode, resource_type)
+
+        binary_path = self.path_to_binary_resource(episode, resource_type)
+        if not os.path.exists(binary_path):
+            binary_path = None
+
+        url = self._resource(resource_type, episode).url
+        if adopted:
+            fingerprint = None
+        else:
+            fingerprint = self.resource_fingerprint(resource_type, episode)
+
+        return self.manifest.make_entry(episode, resource_type, path,
+                                        binary=binary_path, url=url,
+                                        fingerprint=fingerprint)
+
+    def plugin_version(self):
+        """Version of the package providing this plugin (None if unknown)"""
+
+        package = self.__class__.__module__.split('.')[0]
+        return getattr(sys.modules.get(package, None), '__version__', None)
+
+    def resource_fingerprint(self, resource_type, episode):
+        """Fingerprint of everything used to obtain a resource
+
+        It combines resource parameters (URL and source) from YAML
+        configuration file, plugin version and name of the method used to
+        obtain the resource: any change in one of them means the stored
+        resource is outdated.
+
+        Returns
+        -------
+        fingerprint : str
+        """
+
+        resource = self._resource(resource_type, episode)
+
+        data = {
+            TVD_RESOURCE_URL: resource.url,
+            TVD_RESOURCE_SOURCE: resource.source,
+            'version': self.plugin_version(),
+            'method': resource.method.__name__,
+        }
+
+        data = json.dumps(data, sort_keys=True).encode('utf-8')
+        return hashlib.sha1(data).hexdigest()
+
+    def is_outdated(self, resource_type, episode):
+        """Checks whether stored resource is missing or outdated
+
+        A resource is outdated when its fingerprint (see
+        `resource_fingerprint`) differs from the one recorded in the series
+        manifest when it was saved. It is missing when it is not listed in
+        the manifest or when its file was removed since.
+        """
+
+        entry = self.manifest.get(episode, resource_type)
+        if entry is None:
+            return True
+
+        if not os.path.exists(self.manifest.absolute(entry[MANIFEST_PATH])):
+            return True
+
+        fingerprint = self.resource_fingerprint(resource_type, episode)
+        return entry.get(MANIFEST_FINGERPRINT, None) != fingerprint
+
+    def update_manifest(self):
+        """Add resource files missing from the series manifest
+
+        Useful for resources saved before manifests were introduced. Their
+        fingerprint is unknown: they are considered outdated (see
+        `is_outdated`) until they are saved again.
+
+        Returns
+        -------
+        added : int
+            Number of resources added to the manifest
+        """
+
+        entries = []
+
+        for episode, resource_type in self.iter_resources(data=False):
+
+            if (episode, resource_type) in self.manifest:
+                continue
+
+            for compression in RESOURCE_COMPRESSIONS:
+                path = self.path_to_resource(episode, resource_type,
+                                             compression=compression)
+                if os.path.exists(path):
+                    entries.append(self.manifest_entry(
+                        resource_type, episode, path=path, adopted=True))
+                    break
+
+        if entries:
+            self.manifest.update(entries)
+            self.manifest.flush()
+
+        return len(entries)
+
+    def flush_manifest(self):
+        """Save series manifest to disk
+
+        `save_resource` only saves the manifest once every
+        MANIFEST_FLUSH_EVERY resources: call this method once done saving
+        resources.
+        """
+        self.manifest.flush()
+
+    def missing_resources(self):
+        """List resources missing from the series manifest
+
+        Returns
+        -------
+        missing : list
+            List of (episode, resource_type) tuples
+        """
+
+        return [(episode, resource_type)
+                for episode, resource_type in self.iter_resources(data=False)
+                if (episode, resource_type) not in self.manifest]
+
+    def verify_resources(self):
+        """Check integrity of resources listed in the series manifest
+
+        Returns
+        -------
+        errors : dict
+            errors[(episode, resource_type)] describes the problem
+            (e.g. missing or modified file) with this resource
+        """
+
+        errors = {}
+
+        for entry in self.manifest:
+            error = self.manifest.verify(entry)
+            if error is not None:
+                episode = Episode(*entry[MANIFEST_EPISODE])
+                errors[episode, entry[MANIFEST_RESOURCE]] = error
+
+        return errors
+
     def get_resource_from_disk(self, resource_type, episode):
         """Load resource from disk, store it in memory and return it
 
@@ -177,13 +1019,15 @@ class ResourceMixin(object):
         msg = 'getting {t:s} for {e!s} from disk'
         logging.debug(msg.format(e=episode, t=resource_type))
 
-        path = self.path_to_resource(episode, resource_type)
-        result = load_json(path)
+        path = self._path_to_existing_resource(resource_type, episode)
+        result = load_resource(path, episode=episode,
+                               resource_type=resource_type)
 
         msg = 'saving {t:s} for {e!s} into memory'
         logging.debug(msg.format(e=episode, t=resource_type))
 
-        self.resources[episode][resource_type]['result'] = result
+        self.cache.set((episode, resource_type), result,
+                       size=self._size_on_disk(path, resource_type, episode))
 
         return result
 
@@ -211,9 +1055,10 @@ class ResourceMixin(object):
         msg = 'getting {t:s} for {e!s} from memory'
         logging.debug(msg.format(e=episode, t=resource_type))
 
-        result = self.resources[episode][resource_type]['result']
+        try:
+            result = self.cache.get((episode, resource_type))
 
-        if result is None:
+        except KeyError:
             msg = 'resource {t:s} for {e!s} is not available in memory'
             raise ValueError(msg.format(e=episode, t=resource_type))
 
@@ -243,20 +1088,92 @@ class ResourceMixin(object):
         msg = 'getting {t:s} for {e!s} from plugin'
         logging.debug(msg.format(e=episode, t=resource_type))
 
-        resource = self.resources[episode][resource_type]
-        method = resource['method']
-        params = resource['params']
+        resource = self._resource(resource_type, episode)
+        method = resource.method
+        # parameters are built on demand (see ResourceRow)
+        params = resource.params
 
-        T.reset()
-        result = method(**params)
+        # drifting times (T()) are labeled 'A', 'B', ... within each call
+        with drifting_namespace():
+            result = method(**params)
 
         msg = 'saving {t:s} for {e!s} into memory'
         logging.debug(msg.format(e=episode, t=resource_type))
 
-        self.resources[episode][resource_type]['result'] = result
+        self.cache.set((episode, resource_type), result)
 
         return result
 
+    def build_resources(self, items, max_workers=None):
+        """Get resources from plugin, in a pool of processes
+
+        Plugin methods (mostly HTML parsing) are CPU-bound and do not
+        benefit from threads. Each worker process instantiates its own copy
+        of the plugin. Results are stored into memory, as
+        `get_resource_from_plugin` does.
+
+        Parameters
+        ----------
+        items : iterable
+            (episode, resource_type) iterable
+        max_workers : int, optional
+            Number of worker processes. Defaults to number of CPUs.
+
+        Yields
+        ------
+        episode : Episode
+        resource_type : str
+        resource : Timeline, Annotation or Transcription
+            None if plugin failed to provide the resource.
+        error : Exception
+            Exception raised by plugin (None on success).
+
+        Resources are yielded in order of completion.
+        """
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                builds = self._submit_builds(items, executor)
+                for item in self._collect_builds(builds):
+                    yield item
+        finally:
+            self.forget_downloads()
+
+    def _submit_builds(self, items, executor):
+        """Submit plugin calls to process pool `executor`"""
+
+        builds = {}
+        for episode, resource_type in items:
+            future = executor.submit(build_resource, self.__class__,
+                                     self.tvd_dir, resource_type, episode)
+            builds[future] = (episode, resource_type)
+        return builds
+
+    def _collect_builds(self, builds):
+        """Gather results of `_submit_builds`, in order of completion"""
+
+        for future in as_completed(builds):
+
+            episode, resource_type = builds[future]
+
+            try:
+                result = loads_json(future.result())
+                if result is None:
+                    raise ValueError('plugin returned None')
+
+            except Exception as e:
+                self.unavailable.add(('plugin', episode, resource_type),
+                                     reason=e)
+                yield episode, resource_type, None, e
+                continue
+
+            msg = 'saving {t:s} for {e!s} into memory'
+            logging.debug(msg.format(e=episode, t=resource_type))
+
+            self.cache.set((episode, resource_type), result)
+
+            yield episode, resource_type, result, None
+
     def get_resource(self, resource_type, episode, update=False):
         """Get resource
 
@@ -274,36 +1191,78 @@ class ResourceMixin(object):
         Raises
         ------
         ValueError
-            If plugin failed to provide the requested resource.
+            If plugin failed to provide the requested resource (now or less
+            than NEGATIVE_CACHE_TTL seconds ago).
 
         """
 
-        result = None
-
-        if update:
-            funcs = [self.get_resource_from_plugin]
+        result, _ = self._get_resource(resource_type, episode, update=update)
+        return result
 
-        else:
-            funcs = [self.get_resource_from_memory,
-                     self.get_resource_from_disk,
-                     self.get_resource_from_plugin]
+    def _get_resource(self, resource_type, episode, update=False,
+                      memory=True):
+        """Same as `get_resource` but also returns where resource came from
 
-        for func in funcs:
-            try:
-                result = func(resource_type, episode)
-                break
+        Use memory=False to skip memory look-up (e.g. when the caller has
+        just missed it, so that the miss is not counted twice).
 
-            except:
-                continue
+        Returns
+        -------
+        resource : Timeline, Annotation or Transcription
+        tier : str
+            RESOURCE_IN_MEMORY, RESOURCE_ON_DISK or RESOURCE_FROM_PLUGIN
+        """
 
-        if result is None:
-            error = 'cannot get {t:s} for episode {e!s}'
+        if not self.has_resource(resource_type, episode):
+            error = 'no {t:s} resource for episode {e!s}'
             raise ValueError(error.format(t=resource_type, e=episode))
 
-        return result
+        if not update:
+
+            # a single cache look-up, so that cache statistics count
+            # every miss (see ResourceCache.stats)
+            if memory:
+                try:
+                    result = self.get_resource_from_memory(resource_type,
+                                                           episode)
+                    return result, self.RESOURCE_IN_MEMORY
+                except ValueError:
+                    pass
+
+            if self.on_disk(resource_type, episode):
+                try:
+                    result = self.get_resource_from_disk(
+                        resource_type, episode)
+                    return result, self.RESOURCE_ON_DISK
+                except Exception as e:
+                    msg = 'failed to load {t:s} for {e!s} from disk: {error}'
+                    logging.warning(
+                        msg.format(t=resource_type, e=episode, error=e))
+
+        error = 'cannot get {t:s} for episode {e!s}'
+
+        # do not call plugin again if it failed recently
+        key = ('plugin', episode, resource_type)
+        reason = self.unavailable.reason(key)
+        if reason is not None:
+            error += ' (known failure: {reason})'
+            raise ValueError(
+                error.format(t=resource_type, e=episode, reason=reason))
+
+        try:
+            result = self.get_resource_from_plugin(resource_type, episode)
+            if result is None:
+                raise ValueError('plugin returned None')
+
+        except Exception as e:
+            self.unavailable.add(key, reason=e)
+            six.raise_from(
+                ValueError(error.format(t=resource_type, e=episode)), e)
+
+        return result, self.RESOURCE_FROM_PLUGIN
 
     def iter_resources(self, resource_type=None, episode=None,
-                       data=False, update=True):
+                       data=False, update=False, prefetch=0):
         """Resource iterator
 
         Resources are yielded in episode chronological order
@@ -317,14 +1276,36 @@ class ResourceMixin(object):
             When provided, only iterate over resources for this episode
         data : boolean, optional
             Whether to yield actual data
+        update : boolean, optional
+            When True, always get data from plugin. Defaults to getting data
+            from memory first, then from disk, and only from plugin for
+            missing resources. Number of resources obtained from each tier
+            is logged at the end of iteration and kept in `iteration_stats`.
+        prefetch : int, optional
+            When `data` is True, load up to `prefetch` upcoming resources in
+            background threads while the current one is being processed.
+            Defaults to 0 (i.e. load each resource only when it is needed).
 
         Returns
         -------
         (episode, resource_type[, data]) iterator
         """
 
+        if data:
+            items = self.iter_resources(resource_type=resource_type,
+                                        episode=episode, data=False)
+            for item in self._iter_data(items, update, prefetch):
+                yield item
+            return
+
+        # work on a snapshot: self.resources must not be locked while
+        # the caller consumes the iterator
+        with self._resources_lock:
+            resources = [(_episode, sorted(_resources))
+                         for _episode, _resources in self.resources.items()]
+
         # loop on episodes in airing chronological order
-        for _episode in sorted(self.resources):
+        for _episode, _resource_types in sorted(resources):
 
             # skip this episode if not requested
             if (episode is not None) and \
@@ -332,21 +1313,73 @@ class ResourceMixin(object):
                 continue
 
             # loop on resources in name alphabetical order
-            for _resource_type in sorted(self.resources[_episode]):
+            for _resource_type in _resource_types:
 
                 # skip this resource if not requested
                 if (resource_type is not None) and \
                    (resource_type != _resource_type):
                     continue
 
-                # really get this resource
-                if data:
-                    _data = self.get_resource(_resource_type, _episode,
-                                              update=update)
-                    yield _episode, _resource_type, _data
+                yield _episode, _resource_type
 
-                else:
-                    yield _episode, _resource_type
+    def _iter_data(self, items, update, prefetch):
+        """Get resources in order and keep track of where they came from"""
+
+        if prefetch > 0:
+            results = self._iter_prefetched(items, update, prefetch)
+        else:
+            results = (
+                (_episode, _resource_type) +
+                self._get_resource(_resource_type, _episode, update=update)
+                for _episode, _resource_type in items)
+
+        stats = collections.Counter()
+
+        for _episode, _resource_type, _data, tier in results:
+            stats[tier] += 1
+            yield _episode, _resource_type, _data
+
+        self.iteration_stats = stats
+
+        msg = ('{n:d} resource(s): {memory:d} from memory, '
+               '{disk:d} from disk, {plugin:d} from plugin')
+        logging.info(msg.format(n=sum(stats.values()),
+                                memory=stats[self.RESOURCE_IN_MEMORY],
+                                disk=stats[self.RESOURCE_ON_DISK],
+                                plugin=stats[self.RESOURCE_FROM_PLUGIN]))
+
+    def _iter_prefetched(self, items, update, prefetch):
+        """Get resources in order, loading `prefetch` of them ahead of time"""
+
+        # (episode, resource_type, future) of upcoming resources
+        pending = collections.deque()
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+
+            def _schedule():
+                item = next(items, None)
+                if item is None:
+                    return
+                _episode, _resource_type = item
+                future = executor.submit(self._get_resource, _resource_type,
+                                         _episode, update=update)
+                pending.append((_episode, _resource_type, future))
+
+            try:
+                for _ in range(prefetch):
+                    _schedule()
+
+                while pending:
+                    _episode, _resource_type, future = pending.popleft()
+                    # keep at most `prefetch` resources ahead of consumer
+                    _schedule()
+                    _data, tier = future.result()
+                    yield _episode, _resource_type, _data, tier
+
+            finally:
+                # consumer stopped early or loading failed
+                for _, _, future in pending:
+                    future.cancel()
 
     def get_all_resources(self, update=False):
 
@@ -365,6 +1398,137 @@ class ResourceMixin(object):
 
         return resources
 
+    def get_resources(self, episodes=None, resource_types=None,
+                      update=False, max_workers=None, processes=False):
+        """Get many resources at once, loading them in parallel
+
+        Parameters
+        ----------
+        episodes : iterable of `tvd.Episode`, optional
+            Defaults to all episodes.
+        resource_types : iterable of str, optional
+            Defaults to all resource types available for each episode.
+        update : bool, optional
+            See `get_resource`.
+        max_workers : int, optional
+            Number of parallel workers.
+        processes : bool, optional
+            When True, decode resource files and call plugin methods in a
+            pool of processes rather than threads (both are CPU-bound).
+            Resources already in memory are obtained in the calling thread.
+
+        Returns
+        -------
+        resources : dict
+            resources[episode][resource_type] contains requested resource
+        errors : dict
+            errors[episode][resource_type] contains the exception raised when
+            trying to get resource `resource_type` for `episode`.
+        """
+
+        with self._resources_lock:
+            if episodes is None:
+                episodes = sorted(self.resources)
+            available = dict((episode, sorted(self.resources.get(episode, {})))
+                             for episode in episodes)
+
+        # gather requested (episode, resource_type) pairs
+        items = []
+        for episode in episodes:
+            if resource_types is None:
+                _resource_types = available[episode]
+            else:
+                _resource_types = resource_types
+            for resource_type in _resource_types:
+                items.append((episode, resource_type))
+
+        resources = {}
+        errors = {}
+
+        def _collect(episode, resource_type, func, *args, **kwargs):
+            # report errors rather than raising them
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                errors.setdefault(episode, {})[resource_type] = e
+                return False
+            resources.setdefault(episode, {})[resource_type] = result
+            return True
+
+        if processes:
+
+            # only resources not already in memory go to the process pool
+            from_disk = []
+            from_plugin = []
+            others = []
+            for episode, resource_type in items:
+                if not self.has_resource(resource_type, episode):
+                    others.append((episode, resource_type))
+                    continue
+                status = self.resource_status(resource_type, episode)
+                if update and status != self.RESOURCE_FAILED:
+                    from_plugin.append((episode, resource_type))
+                elif status == self.RESOURCE_ON_DISK:
+                    from_disk.append((episode, resource_type))
+                elif status is None:
+                    from_plugin.append((episode, resource_type))
+                else:
+                    others.append((episode, resource_type))
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+
+                futures = [
+                    executor.submit(
+                        load_resource,
+                        self._path_to_existing_resource(resource_type,
+                                                        episode),
+                        episode=episode, resource_type=resource_type)
+                    for episode, resource_type in from_disk]
+
+                # plugin calls are slower: queue them after disk loads
+                builds = self._submit_builds(from_plugin, executor)
+
+                # meanwhile, get other resources in this process
+                # (from memory, or raising the appropriate error)
+                for episode, resource_type in others:
+                    _collect(episode, resource_type, self.get_resource,
+                             resource_type, episode, update=update)
+
+                for episode, resource_type, result, error in \
+                        self._collect_builds(builds):
+                    if error is None:
+                        resources.setdefault(episode, {})[resource_type] = \
+                            result
+                    else:
+                        errors.setdefault(episode, {})[resource_type] = error
+
+                for (episode, resource_type), future in zip(from_disk,
+                                                            futures):
+
+                    if not _collect(episode, resource_type, future.result):
+                        continue
+
+                    # store into memory, as get_resource_from_disk does
+                    path = self._on_disk[(episode, resource_type)]
+                    self.cache.set((episode, resource_type),
+                                   resources[episode][resource_type],
+                                   size=self._size_on_disk(
+                                       path, resource_type, episode))
+
+        else:
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+                futures = [
+                    executor.submit(self.get_resource, resource_type, episode,
+                                    update=update)
+                    for episode, resource_type in items]
+
+                for (episode, resource_type), future in zip(items, futures):
+                    _collect(episode, resource_type, future.result)
+
+        return resources, errors
+
     CHARACTER_MAPPING = {
         # hyphen
         ord(u'\u2013'): u"-",    # –
@@ -408,6 +1572,12 @@ class ResourceMixin(object):
     def download_as_utf8(self, url):
         """Download webpage content as UTF-8
 
+        Several resources often come from the same webpage: concurrent
+        requests for the same URL share one download, and the text of the
+        HTTP_MEMOIZE most recently downloaded pages is kept for later
+        requests, for HTTP_MEMOIZE_TTL seconds at most (see
+        `forget_downloads`). Failed downloads are not remembered.
+
         Parameters
         ----------
         url : str
@@ -422,11 +1592,93 @@ class ResourceMixin(object):
 
         """
 
-        # request URL content with dummy user-agent
-        user_agent = {'User-agent': 'TVD'}
-        r = requests.get(url, headers=user_agent)
+        with self._downloads_lock:
+
+            if self.HTTP_MEMOIZE:
+                try:
+                    expires, text = self._pages.get(url)
+                except KeyError:
+                    pass
+                else:
+                    if _clock() < expires:
+                        return text
+                    self._pages.evict(url)
+
+            future = self._downloads.get(url, None)
+            download = future is None
+            if download:
+                future = Future()
+                self._downloads[url] = future
+
+        # someone else is downloading it
+        if not download:
+            logging.debug('{url} already requested'.format(url=url))
+            return future.result()
+
+        try:
+            # get content as UTF-8 unicode
+            content = self._download(url)
+            text = self.clean_text(content.decode('utf-8', 'replace'))
+
+        except Exception as e:
+            with self._downloads_lock:
+                self._downloads.pop(url, None)
+            future.set_exception(e)
+            raise
+
+        with self._downloads_lock:
+            self._downloads.pop(url, None)
+            if self.HTTP_MEMOIZE:
+                self._pages.set(url, (_clock() + self.HTTP_MEMOIZE_TTL, text))
+
+        future.set_result(text)
+        return text
+
+    def forget_downloads(self):
+        """Forget webpages kept in memory by `download_as_utf8`
+
+        Called at the end of `build_resources` and of "create metadata".
+        """
+        self._pages.evict()
+
+    def _download(self, url):
+        """Download raw webpage content, going through HTTP cache"""
+
+        cached = None
+        headers = {}
+
+        if self.http_cache is not None:
+
+            cached = self.http_cache.get(url)
+
+            if cached is not None:
+
+                body, meta = cached
+
+                if self.http_offline:
+                    logging.debug('{url} served from cache'.format(url=url))
+                    return body
+
+                # only download content if it has changed
+                headers = self.http_cache.conditional_headers(meta)
+
+        try:
+            # use shared (pooled, keep-alive) HTTP session
+            r = self.session.get(url, headers=headers,
+                                 timeout=self.http_timeout)
+
+        except requests.RequestException as e:
+            if cached is None:
+                raise
+            msg = 'failed to revalidate {url} ({e}): using cached copy'
+            logging.warning(msg.format(url=url, e=e))
+            return cached[0]
+
+        if r.status_code == 304 and cached is not None:
+            logging.debug('{url} not modified'.format(url=url))
+            return cached[0]
 
-        # get content as UTF-8 unicode
-        r.encoding = 'UTF-8'
+        if r.status_code == 200 and self.http_cache is not None:
+            self.http_cache.set(url, r.content, r.headers)
 
-        return self.clean_text(r.text)
+        return r.content
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+"""Fixtures: a (fake) series plugin, and a TVD root directory using it"""
+
+import sys
+import textwrap
+import importlib
+
+import pytest
+
+SERIES = 'TVDTestSeries'
+
+PLUGIN = textwrap.dedent('''
+    from tvd import Plugin, T, TStart, TEnd
+    from tvd import Segment, Annotation, Transcription
+
+
+    class TVDTestSeries(Plugin):
+
+        # (method, url) of plugin calls made by this process
+        calls = []
+
+        def outline(self, url=None, episode=None, **kwargs):
+            self.calls.append(('outline', url))
+            return {'episode': episode, 'outline': url}
+
+        def speaker(self, url=None, episode=None, **kwargs):
+            self.calls.append(('speaker', url))
+            annotation = Annotation(uri=episode, modality='speaker')
+            annotation[Segment(0., 1.), 'track'] = 'sheldon'
+            return annotation
+
+        def transcript(self, url=None, episode=None, **kwargs):
+            self.calls.append(('transcript', url))
+            transcription = Transcription(episode=episode)
+            t1, t2 = T(), T()
+            transcription.add_edge(TStart, t1)
+            transcription.add_edge(t1, t2, speech=url, speaker='sheldon')
+            transcription.add_edge(t2, TEnd)
+            return transcription
+
+        def failing(self, url=None, episode=None, **kwargs):
+            self.calls.append(('failing', url))
+            raise ValueError('failing resource')
+''')
+
+CONFIG = textwrap.dedent('''
+    name: TVD test series
+    language: en
+    episodes: [2]
+    resources:
+        outline:
+            url:
+                - {season: 1, episode: 1, url: 'http://example.com/1'}
+                - {season: 1, episode: 2, url: 'http://example.com/2'}
+        speaker:
+            url:
+                - {season: 1, episode: 1, url: 'http://example.com/1'}
+                - {season: 1, episode: 2, url: 'http://example.com/2'}
+        transcript:
+            url:
+                - {season: 1, episode: 1, url: 'http://example.com/1'}
+        failing:
+            url:
+                - {season: 1, episode: 2, url: 'http://example.com/2'}
+''')
+
+
+def install_plugin(directory, series, plugin=PLUGIN, config=CONFIG):
+    """Write `series` plugin package (and its entry point) to `directory`"""
+
+    package = directory.mkdir(series)
+    package.join('__init__.py').write(plugin)
+    package.join('tvd.yml').write(config)
+
+    distribution = directory.mkdir('{0}-1.0.dist-info'.format(series))
+    distribution.join('METADATA').write(
+        'Metadata-Version: 2.1\nName: {0}\nVersion: 1.0\n'.format(series))
+    distribution.join('entry_points.txt').write(
+        '[tvd.series]\n{0} = {0}:{0}\n'.format(series))
+
+
+@pytest.fixture(scope='session')
+def plugin_class(tmpdir_factory):
+    """Series plugin class, importable as `TVDTestSeries`
+
+    It is also declared as a 'tvd.series' entry point.
+    """
+
+    directory = tmpdir_factory.mktemp('plugins')
+    install_plugin(directory, SERIES)
+
+    sys.path.insert(0, str(directory))
+    yield getattr(importlib.import_module(SERIES), SERIES)
+    sys.path.remove(str(directory))
+
+
+@pytest.fixture
+def installer():
+    """`install_plugin` function"""
+    return install_plugin
+
+
+@pytest.fixture
+def series(plugin_class, tmpdir, monkeypatch):
+    """Plugin instance, with its own TVD root (and cache) directory"""
+
+    monkeypatch.setenv('TVD_CACHE_DIR', str(tmpdir.join('cache')))
+    del plugin_class.calls[:]
+
+    return plugin_class(str(tmpdir.join('tvd')), acknowledgment=False)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+
+import asyncio
+
+import pytest
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_aget_resource(series):
+
+    episode = sorted(series.resources)[0]
+
+    outline = _run(series.aget_resource('outline', episode))
+    assert outline == series.get_resource('outline', episode)
+    assert _run(series.aget_resource('outline', episode)) == outline
+    assert series.calls == [('outline', 'http://example.com/1')]
+
+    # memory was missed only once
+    stats = series.cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+
+def test_aget_resource_update(series):
+
+    episode = sorted(series.resources)[0]
+    _run(series.aget_resource('outline', episode))
+    _run(series.aget_resource('outline', episode, update=True))
+    assert len(series.calls) == 2
+
+
+def test_aget_resource_failure(series):
+
+    episode = sorted(series.resources)[1]
+    with pytest.raises(ValueError):
+        _run(series.aget_resource('failing', episode))
+
+
+def test_aiter_resources(series):
+
+    async def _collect():
+        return [item async for item in series.aiter_resources(
+            resource_type='speaker', concurrency=1)]
+
+    resources = _run(_collect())
+    assert resources == list(series.iter_resources(resource_type='speaker',
+                                                   data=True))
+    assert len(series.calls) == len(resources)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import pytest
+from pyannote.core import T, Segment, Timeline, Annotation, Transcription
+
+from tvd import Episode
+from tvd.core import binary
+
+
+EPISODE = Episode(series='TheBigBangTheory', season=1, episode=2)
+
+
+def _round_trip(data, tmpdir):
+    path = str(tmpdir.join('resource.npz'))
+    binary.dump(data, path)
+    return binary.load(path)
+
+
+def _edges(transcription):
+    return sorted((t1, t2, k, sorted(attrs.items()))
+                  for t1, t2, k, attrs
+                  in transcription.edges(keys=True, data=True))
+
+
+def test_timeline(tmpdir):
+
+    timeline = Timeline(segments=[Segment(0., 1.5), Segment(2., 3.25)],
+                        uri=EPISODE)
+
+    loaded = _round_trip(timeline, tmpdir)
+
+    assert isinstance(loaded, Timeline)
+    assert isinstance(loaded.uri, Episode)
+    assert loaded.uri == EPISODE
+    assert list(loaded) == list(timeline)
+
+
+def test_annotation(tmpdir):
+
+    annotation = Annotation(uri=EPISODE, modality='speaker')
+    annotation[Segment(0., 1.), 'track'] = 'sheldon'
+    # non-string tracks and labels
+    annotation[Segment(1., 2.), 1] = 2
+    annotation[Segment(2., 3.), 0.5] = 'leonard'
+
+    loaded = _round_trip(annotation, tmpdir)
+
+    assert isinstance(loaded, Annotation)
+    assert loaded.uri == EPISODE
+    assert loaded.modality == 'speaker'
+    assert sorted(loaded.itertracks(label=True)) == \
+        sorted(annotation.itertracks(label=True))
+
+
+def test_transcription(tmpdir):
+
+    transcription = Transcription(episode=EPISODE)
+    # anchored and drifting nodes
+    t0, t1, t2 = T(1.), T(), T(3.5)
+    transcription.add_edge(t0, t1, speech='Hello', speaker='sheldon')
+    transcription.add_edge(t1, t2, speech='Hi', speaker='leonard')
+    # non-string edge key, parallel edges
+    transcription.add_edge(t0, t2, key=0, scene=1)
+    transcription.add_edge(t0, t2, key=1, scene=2)
+    transcription.add_node(t1, shot=3)
+
+    loaded = _round_trip(transcription, tmpdir)
+
+    assert isinstance(loaded, Transcription)
+    assert loaded.graph['episode'] == EPISODE
+    assert sorted(loaded.nodes(data=True)) == \
+        sorted(transcription.nodes(data=True))
+    assert [t.anchored for t in sorted(loaded.nodes())] == \
+        [t.anchored for t in sorted(transcription.nodes())]
+    assert _edges(loaded) == _edges(transcription)
+
+
+def test_unsupported(tmpdir):
+
+    assert not binary.supports({'episode': EPISODE})
+
+    with pytest.raises(TypeError):
+        binary.dump({'episode': EPISODE}, str(tmpdir.join('resource.npz')))
+
+
+def test_strings(tmpdir):
+
+    # strings looking like JSON, non-finite and nested values
+    annotation = Annotation(uri=EPISODE)
+    annotation[Segment(0., 1.), '[1, 2]'] = 'a,b'
+    annotation[Segment(1., 2.), float('inf')] = '"'
+    annotation[Segment(2., 3.), 'track'] = ''
+
+    loaded = _round_trip(annotation, tmpdir)
+
+    assert sorted(loaded.itertracks(label=True)) == \
+        sorted(annotation.itertracks(label=True))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import pytest
+
+from tvd.plugin import cache
+from tvd.plugin.cache import ResourceCache, NegativeCache
+
+
+def test_lru_entries():
+
+    c = ResourceCache(max_entries=2)
+    c.set('a', 1)
+    c.set('b', 2)
+    # 'a' becomes most recently used...
+    assert c.get('a') == 1
+    c.set('c', 3)
+    # ... so 'b' is evicted
+    assert 'b' not in c
+    assert 'a' in c and 'c' in c
+    assert len(c) == 2
+
+
+def test_lru_bytes():
+
+    c = ResourceCache(max_bytes=10)
+    c.set('a', 'a', size=4)
+    c.set('b', 'b', size=4)
+    c.set('c', 'c', size=4)
+    assert 'a' not in c
+    assert c.nbytes == 8
+
+    # most recently used value is kept, even if larger than budget
+    c.set('d', 'd', size=100)
+    assert 'd' in c and len(c) == 1
+    assert c.nbytes == 100
+
+
+def test_sizeof():
+
+    c = ResourceCache(max_bytes=10, sizeof=len)
+    c.set('a', 'abcdef')
+    c.set('b', 'abcdef')
+    assert 'a' not in c
+    assert c.nbytes == 6
+
+
+def test_evict():
+
+    c = ResourceCache()
+    c.set('a', 1)
+    c.set('b', 2)
+    c.set('c', 3)
+
+    assert c.evict('a') == 1
+    assert c.evict('a') == 0
+    assert c.evict() == 2
+    assert len(c) == 0
+    assert c.stats()['evictions'] == 3
+
+
+def test_plugin_cache(series):
+
+    series.init_cache(max_entries=2)
+
+    episode = sorted(series.resources)[0]
+    for resource_type in ['outline', 'speaker', 'transcript']:
+        series.get_resource(resource_type, episode)
+
+    # least recently used resource was evicted...
+    assert not series.in_memory('outline', episode)
+    assert series.in_memory('speaker', episode)
+    assert series.in_memory('transcript', episode)
+
+    # ... and obtained again from plugin
+    del series.calls[:]
+    series.get_resource('outline', episode)
+    assert series.calls == [('outline', 'http://example.com/1')]
+
+    assert series.evict_resources(episode=episode) == 2
+    assert len(series.cache) == 0
+
+
+def test_stats():
+
+    c = ResourceCache()
+    c.set('a', 1)
+    c.get('a')
+    with pytest.raises(KeyError):
+        c.get('b')
+
+    assert c.stats() == {'entries': 1, 'bytes': 0, 'hits': 1, 'misses': 1,
+                         'evictions': 0}
+
+
+def test_negative_cache():
+
+    c = NegativeCache()
+    c.add('a', reason='not found')
+    assert 'a' in c
+    assert c.reason('a') == 'not found'
+    assert 'b' not in c
+
+    c.discard('a')
+    assert 'a' not in c
+
+
+def test_negative_cache_ttl(monkeypatch):
+
+    now = [0.]
+    monkeypatch.setattr(cache, '_clock', lambda: now[0])
+
+    c = NegativeCache(ttl=10.)
+    c.add('a')
+    now[0] = 5.
+    assert 'a' in c
+    now[0] = 11.
+    assert 'a' not in c
+    assert len(c) == 0
+
+
+def test_plugin_stats(series):
+
+    episode = sorted(series.resources)[0]
+    series.get_resource('outline', episode)
+    series.get_resource('outline', episode)
+
+    stats = series.cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_plugin_failure(series):
+
+    episode = sorted(series.resources)[1]
+    assert series.resource_status('failing', episode) is None
+
+    with pytest.raises(ValueError):
+        series.get_resource('failing', episode)
+    assert series.resource_status('failing', episode) == \
+        series.RESOURCE_FAILED
+
+    # plugin is not called again...
+    with pytest.raises(ValueError) as error:
+        series.get_resource('failing', episode)
+    assert 'known failure' in str(error.value)
+    assert series.calls == [('failing', 'http://example.com/2')]
+
+    # ... until failure is forgotten
+    series.unavailable.clear()
+    with pytest.raises(ValueError):
+        series.get_resource('failing', episode)
+    assert len(series.calls) == 2
+
+
+def test_plugin_status(series):
+
+    episode = sorted(series.resources)[0]
+    assert not series.on_disk('outline', episode)
+
+    series.get_resource('outline', episode)
+    assert series.resource_status('outline', episode) == \
+        series.RESOURCE_IN_MEMORY
+
+    series.save_resource('outline', episode,
+                         series.get_resource('outline', episode))
+    series.evict_resources()
+    assert series.resource_status('outline', episode) == \
+        series.RESOURCE_ON_DISK
+
+    with pytest.raises(ValueError):
+        series.get_resource('outline', 'not an episode')
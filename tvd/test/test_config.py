@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+
+from tvd.plugin import config
+from tvd.plugin.config import load_config
+
+
+CONFIG = """
+outline:
+    1:
+        1: http://example.com/s01e01
+        2: http://example.com/s01e02
+"""
+
+
+def _config(tmpdir, content=CONFIG):
+    path = tmpdir.join('tvd.yml')
+    path.write(content)
+    return str(path)
+
+
+def test_load_config(tmpdir):
+
+    path = _config(tmpdir)
+    cache_dir = str(tmpdir.join('cache'))
+
+    expected = {'outline': {1: {1: 'http://example.com/s01e01',
+                                2: 'http://example.com/s01e02'}}}
+
+    assert load_config(path, cache_dir=cache_dir) == expected
+
+    # cached on disk...
+    assert len(os.listdir(os.path.join(cache_dir, 'config'))) == 1
+
+    # ... and used by other processes
+    config._CONFIGS.clear()
+    assert load_config(path, cache_dir=cache_dir) == expected
+
+
+def test_copy(tmpdir):
+
+    path = _config(tmpdir)
+
+    first = load_config(path, cache_dir=False)
+    first['outline'][1].clear()
+
+    assert len(load_config(path, cache_dir=False)['outline'][1]) == 2
+
+
+def test_modified(tmpdir):
+
+    path = _config(tmpdir)
+    cache_dir = str(tmpdir.join('cache'))
+    load_config(path, cache_dir=cache_dir)
+
+    with open(path, 'w') as f:
+        f.write('outline: {}\n')
+    # make sure modification time changes
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert load_config(path, cache_dir=cache_dir) == {'outline': {}}
+
+    config._CONFIGS.clear()
+    assert load_config(path, cache_dir=cache_dir) == {'outline': {}}
+
+
+def test_no_disk_cache(tmpdir):
+
+    path = _config(tmpdir)
+    load_config(path, cache_dir=False)
+
+    assert tmpdir.listdir() == [tmpdir.join('tvd.yml')]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import pytest
+
+create = pytest.importorskip('tvd.create')
+
+
+def _saved(series):
+    return sorted((episode, resource_type)
+                  for episode, resource_type
+                  in series.iter_resources(data=False)
+                  if series.on_disk(resource_type, episode))
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_metadata(series, jobs):
+
+    create.do_metadata(series, jobs=jobs)
+
+    # all but failing resource
+    expected = sorted((episode, resource_type)
+                      for episode, resource_type
+                      in series.iter_resources(data=False)
+                      if resource_type != 'failing')
+    assert _saved(series) == expected
+
+    series = series.__class__(series.tvd_dir, acknowledgment=False)
+    assert len(series.manifest) == len(expected)
+
+    episode = sorted(series.resources)[0]
+    transcription = series.get_resource('transcript', episode)
+    assert sorted(transcription.edges(data=True))[1][2]['speech'] == \
+        'http://example.com/1'
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_metadata_force(series, jobs):
+
+    episode = sorted(series.resources)[0]
+    series.save_resource('outline', episode, {'outline': 'outdated'})
+
+    create.do_metadata(series, jobs=jobs)
+    series.evict_resources()
+    assert series.get_resource('outline', episode) == \
+        {'outline': 'outdated'}
+
+    # existing files are obtained from plugin again
+    create.do_metadata(series, jobs=jobs, force=True)
+    series.evict_resources()
+    assert series.get_resource('outline', episode) == \
+        {'episode': episode, 'outline': 'http://example.com/1'}
+
+
+def test_metadata_sync(series):
+
+    create.do_metadata(series)
+    del series.calls[:]
+
+    # up to date resources are not obtained again
+    create.do_metadata(series, sync=True)
+    assert all(method == 'failing' for method, _ in series.calls)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_metadata_compression(series, jobs):
+
+    with pytest.raises(ValueError):
+        create.do_metadata(series, jobs=jobs, compression='zip')
+
+    # nothing was even attempted
+    assert series.calls == []
+    assert _saved(series) == []
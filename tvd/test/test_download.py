@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tvd.plugin import resource
+
+
+@pytest.fixture
+def downloads(series, monkeypatch):
+    """URLs actually downloaded by `series`"""
+
+    downloaded = []
+    lock = threading.Lock()
+
+    def _download(url):
+        with lock:
+            downloaded.append(url)
+        # give concurrent requests time to pile up
+        time.sleep(0.05)
+        if url.endswith('error'):
+            raise IOError(url)
+        return url.encode('utf-8')
+
+    monkeypatch.setattr(series, '_download', _download)
+    return downloaded
+
+
+def test_coalesce(series, downloads):
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        texts = list(executor.map(series.download_as_utf8, ['a'] * 4))
+
+    assert texts == ['a'] * 4
+    assert downloads == ['a']
+
+
+def test_memoize(series, downloads):
+
+    series.HTTP_MEMOIZE = 2
+    series.init_resource({})
+
+    for url in ['a', 'b', 'a', 'c', 'b']:
+        series.download_as_utf8(url)
+
+    # 'b' was evicted by 'c'
+    assert downloads == ['a', 'b', 'c', 'b']
+
+    series.forget_downloads()
+    series.download_as_utf8('b')
+    assert downloads == ['a', 'b', 'c', 'b', 'b']
+
+
+def test_memoize_ttl(series, downloads, monkeypatch):
+
+    now = [0.]
+    monkeypatch.setattr(resource, '_clock', lambda: now[0])
+
+    series.download_as_utf8('a')
+    now[0] = series.HTTP_MEMOIZE_TTL / 2
+    series.download_as_utf8('a')
+    assert downloads == ['a']
+
+    # e.g. get_resource(update=True) on a long-lived instance
+    now[0] = series.HTTP_MEMOIZE_TTL + 1
+    series.download_as_utf8('a')
+    assert downloads == ['a', 'a']
+
+
+def test_no_memoize(series, downloads):
+
+    series.HTTP_MEMOIZE = 0
+    series.init_resource({})
+
+    series.download_as_utf8('a')
+    series.download_as_utf8('a')
+    assert downloads == ['a', 'a']
+
+
+def test_failure(series, downloads):
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(series.download_as_utf8, 'error')
+                   for _ in range(2)]
+        for future in futures:
+            with pytest.raises(IOError):
+                future.result()
+
+    # failures are not remembered
+    with pytest.raises(IOError):
+        series.download_as_utf8('error')
+    assert len(downloads) == 2
+
+
+def test_session(series):
+
+    for prefix in ('http://', 'https://'):
+        adapter = series.session.get_adapter(prefix + 'example.com')
+        assert adapter.max_retries.total == series.HTTP_MAX_RETRIES
+        assert adapter.max_retries.backoff_factor == \
+            series.HTTP_BACKOFF_FACTOR
+        assert set(adapter.max_retries.status_forcelist) == \
+            set(series.HTTP_RETRY_STATUS)
+        assert adapter._pool_maxsize == series.HTTP_POOL_SIZE
+
+    assert series.http_timeout == series.HTTP_TIMEOUT
+    assert series.session.headers['User-agent'] == 'TVD'
+
+
+def test_session_options(series):
+
+    series.init_session(pool_size=2, max_retries=0, backoff_factor=0.,
+                        timeout=1.)
+
+    adapter = series.session.get_adapter('http://example.com')
+    assert adapter.max_retries.total == 0
+    assert adapter.max_retries.backoff_factor == 0.
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 2
+    assert series.http_timeout == 1.
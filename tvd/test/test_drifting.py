@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import threading
+
+from pyannote.core import T
+
+from tvd.plugin import drifting
+from tvd.plugin.drifting import drifting_namespace
+
+
+def _labels(n):
+    return [str(T()) for _ in range(n)]
+
+
+def test_namespace():
+
+    # whatever labels were drawn before...
+    _labels(3)
+
+    # ... each block starts from 'A'
+    with drifting_namespace():
+        assert _labels(3) == ['A', 'B', 'C']
+
+    with drifting_namespace():
+        assert _labels(2) == ['A', 'B']
+
+
+def test_nested():
+
+    with drifting_namespace():
+        assert _labels(2) == ['A', 'B']
+        with drifting_namespace():
+            assert _labels(1) == ['A']
+        # outer block resumes where it stopped
+        assert _labels(1) == ['C']
+
+
+def test_reset():
+
+    with drifting_namespace():
+        _labels(2)
+
+    # T.reset() replaces the label generator of the whole process
+    T.reset()
+
+    with drifting_namespace():
+        assert _labels(2) == ['A', 'B']
+
+
+def test_fallback(monkeypatch):
+
+    # pyannote.core internals cannot be patched
+    monkeypatch.setattr(drifting, '_LABELS', None)
+
+    _labels(3)
+    with drifting_namespace():
+        assert _labels(2) == ['A', 'B']
+
+
+def test_threads():
+
+    n_threads = 4
+    barrier = threading.Barrier(n_threads)
+    labels = {}
+
+    def _run(thread):
+        with drifting_namespace():
+            for _ in range(3):
+                # make threads draw labels in lockstep
+                barrier.wait()
+                labels.setdefault(thread, []).append(str(T()))
+
+    threads = [threading.Thread(target=_run, args=(thread, ))
+               for thread in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(labels[thread] == ['A', 'B', 'C']
+               for thread in range(n_threads))
+
+
+def test_plugin(series):
+
+    episode = sorted(series.resources)[0]
+
+    _labels(3)
+    transcription = series.get_resource('transcript', episode)
+    assert sorted(t for t in transcription.nodes() if t.drifting) == \
+        ['A', 'B']
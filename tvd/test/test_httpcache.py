@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+import stat
+
+import pytest
+import requests
+
+from tvd.plugin.httpcache import HTTPCache
+
+URL = 'http://example.com/1'
+
+
+class _Response(object):
+
+    def __init__(self, status_code, content=b'', headers=None):
+        super(_Response, self).__init__()
+        self.status_code = status_code
+        self.content = content
+        self.headers = {} if headers is None else headers
+
+
+class _Session(object):
+    """Replays `responses` (or raises them) and records request headers"""
+
+    def __init__(self, *responses):
+        super(_Session, self).__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_cache(tmpdir):
+
+    cache = HTTPCache(str(tmpdir))
+    assert cache.get(URL) is None
+
+    cache.set(URL, b'<html>', {'ETag': '"v1"'})
+    body, meta = cache.get(URL)
+    assert body == b'<html>'
+    assert cache.conditional_headers(meta) == {'If-None-Match': '"v1"'}
+
+    cache.set(URL, b'<html>', {'Last-Modified': 'Mon, 01 Jun 2015'})
+    _, meta = cache.get(URL)
+    assert cache.conditional_headers(meta) == \
+        {'If-Modified-Since': 'Mon, 01 Jun 2015'}
+
+
+def test_cache_mode(tmpdir):
+
+    cache = HTTPCache(str(tmpdir))
+    cache.set(URL, b'<html>', {})
+
+    umask = os.umask(0)
+    os.umask(umask)
+    for path in cache._paths(URL):
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_cache_failure(tmpdir):
+
+    # cache directory cannot be created
+    tmpdir.join('file').write('')
+    cache = HTTPCache(str(tmpdir.join('file')))
+
+    cache.set(URL, b'<html>', {})
+    assert cache.get(URL) is None
+
+
+def test_conditional_get(series):
+
+    series.init_http_cache(enabled=True)
+    series.session = _Session(
+        _Response(200, b'v1', {'ETag': '"v1"'}),
+        _Response(304),
+        requests.ConnectionError(),
+        _Response(200, b'v2', {'ETag': '"v2"'}))
+
+    assert series._download(URL) == b'v1'
+    assert series.session.requests[0] == (URL, {})
+
+    # not modified
+    assert series._download(URL) == b'v1'
+    assert series.session.requests[1] == (URL, {'If-None-Match': '"v1"'})
+
+    # server cannot be reached
+    assert series._download(URL) == b'v1'
+
+    # modified
+    assert series._download(URL) == b'v2'
+    assert series.http_cache.get(URL)[0] == b'v2'
+
+
+def test_offline(series):
+
+    series.init_http_cache(enabled=True)
+    series.session = _Session(_Response(200, b'v1'))
+    series._download(URL)
+
+    series.init_http_cache(enabled=True, offline=True)
+    assert series._download(URL) == b'v1'
+    assert len(series.session.requests) == 1
+
+
+def test_no_cache(series):
+
+    series.init_http_cache(enabled=False)
+    series.session = _Session(requests.ConnectionError())
+
+    with pytest.raises(requests.ConnectionError):
+        series._download(URL)
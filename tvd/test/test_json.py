@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+from __future__ import unicode_literals
+
+import pytest
+import simplejson as json
+from pyannote.core import T, TStart, TEnd
+from pyannote.core import Segment, Annotation, Transcription
+
+from tvd import Episode
+from tvd.core.json import loads, load, dump, object_hook
+from tvd.core.json import get_backend, JSON_BACKENDS
+
+
+EPISODE = Episode(series='TheBigBangTheory', season=1, episode=2)
+
+
+def _round_trip(data):
+    text = json.dumps(data, for_json=True, allow_nan=True)
+    return loads(text), json.loads(text, object_hook=object_hook)
+
+
+def test_annotation_uri():
+
+    annotation = Annotation(uri=EPISODE)
+    annotation[Segment(0., 1.), 'track'] = 'label'
+
+    decoded, reference = _round_trip(annotation)
+
+    assert isinstance(decoded.uri, Episode)
+    assert decoded.uri == EPISODE == reference.uri
+
+
+def test_transcription_graph():
+
+    transcription = Transcription(episode=EPISODE)
+    transcription.add_edge(T(1.), T(), speech='Hello', speaker='sheldon')
+
+    decoded, reference = _round_trip(transcription)
+
+    assert isinstance(decoded.graph['episode'], Episode)
+    assert decoded.graph['episode'] == EPISODE == reference.graph['episode']
+
+
+def test_nested_resources():
+
+    annotation = Annotation(uri=EPISODE)
+    annotation[Segment(0., 1.), 'track'] = 'label'
+    data = {'episode': EPISODE, 'annotations': [annotation]}
+
+    decoded, _ = _round_trip(data)
+
+    assert decoded['episode'] == EPISODE
+    assert decoded['annotations'][0].uri == EPISODE
+
+
+def _transcription():
+    transcription = Transcription(episode=EPISODE)
+    transcription.add_edge(TStart, T(1.), scene=1)
+    transcription.add_edge(T(1.), T(), speech='Hello', speaker='sheldon')
+    transcription.add_edge(T(), TEnd, scene=1)
+    return transcription
+
+
+def _edges(transcription):
+    return sorted((t1, t2, sorted(attrs.items()))
+                  for t1, t2, attrs in transcription.edges(data=True))
+
+
+@pytest.mark.parametrize('backend', JSON_BACKENDS)
+def test_backend(backend):
+
+    pytest.importorskip(backend)
+
+    transcription = _transcription()
+    decoded = loads(json.dumps(transcription, for_json=True, allow_nan=True),
+                    backend=backend)
+
+    # TStart and TEnd are encoded as -Infinity and Infinity
+    assert isinstance(decoded, Transcription)
+    assert decoded.graph['episode'] == EPISODE
+    assert _edges(decoded) == _edges(transcription)
+
+
+def test_default_backend():
+
+    name, _ = get_backend()
+    assert name != 'orjson'
+
+
+def test_invalid():
+
+    for backend in JSON_BACKENDS:
+        try:
+            get_backend(name=backend)
+        except ImportError:
+            continue
+        with pytest.raises(ValueError):
+            loads('{"a": ', backend=backend)
+
+
+@pytest.mark.parametrize('extension', ['.json', '.json.gz', '.json.xz'])
+def test_compression(tmpdir, extension):
+
+    path = str(tmpdir.join('transcription' + extension))
+    transcription = _transcription()
+    dump(transcription, path)
+
+    assert _edges(load(path)) == _edges(transcription)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+
+from tvd import Episode
+from tvd.core.manifest import Manifest, sha256
+from tvd.core.manifest import MANIFEST_PATH, MANIFEST_SIZE, MANIFEST_SHA256
+from tvd.core.manifest import MANIFEST_URL, MANIFEST_FINGERPRINT
+
+
+EPISODE = Episode(series='TheBigBangTheory', season=1, episode=2)
+
+
+def _resource(tmpdir, name, content='{}'):
+    path = tmpdir.join('metadata', name)
+    path.write(content, ensure=True)
+    return str(path)
+
+
+def test_entry(tmpdir):
+
+    root = str(tmpdir)
+    manifest = Manifest(str(tmpdir.join('manifest.json')), root)
+
+    path = _resource(tmpdir, 'outline.json', content='{"a": 1}')
+    entry = manifest.make_entry(EPISODE, 'outline', path,
+                                url='http://example.com', fingerprint='f')
+
+    assert entry[MANIFEST_PATH] == os.path.join('metadata', 'outline.json')
+    assert manifest.absolute(entry[MANIFEST_PATH]) == path
+    assert entry[MANIFEST_SIZE] == 8
+    assert entry[MANIFEST_SHA256] == sha256(path)
+    assert entry[MANIFEST_URL] == 'http://example.com'
+    assert entry[MANIFEST_FINGERPRINT] == 'f'
+
+
+def test_update(tmpdir):
+
+    root = str(tmpdir)
+    path = str(tmpdir.join('manifest.json'))
+    manifest = Manifest(path, root)
+
+    entry = manifest.make_entry(EPISODE, 'outline',
+                                _resource(tmpdir, 'outline.json'))
+    manifest.update([entry])
+
+    assert (EPISODE, 'outline') in manifest
+    assert manifest.get(EPISODE, 'outline') == entry
+    assert manifest.get(EPISODE, 'speaker') is None
+
+    # saved to disk
+    reloaded = Manifest(path, root)
+    assert len(reloaded) == 1
+    assert reloaded.get(EPISODE, 'outline') == entry
+
+    manifest.remove(EPISODE, 'outline')
+    assert len(Manifest(path, root)) == 0
+
+
+def test_flush_every(tmpdir):
+
+    root = str(tmpdir)
+    path = str(tmpdir.join('manifest.json'))
+    manifest = Manifest(path, root, flush_every=3)
+
+    entries = [manifest.make_entry(EPISODE, resource_type,
+                                   _resource(tmpdir, resource_type + '.json'))
+               for resource_type in ['outline', 'speaker', 'transcript']]
+
+    manifest.update(entries[:2])
+    assert not os.path.exists(path)
+
+    manifest.update(entries[2:])
+    assert len(Manifest(path, root)) == 3
+
+    manifest.remove(EPISODE, 'outline')
+    manifest.update(entries[:1])
+    assert (EPISODE, 'outline') not in Manifest(path, root)
+
+    manifest.flush()
+    assert (EPISODE, 'outline') in Manifest(path, root)
+
+
+def test_verify(tmpdir):
+
+    root = str(tmpdir)
+    manifest = Manifest(str(tmpdir.join('manifest.json')), root)
+
+    path = _resource(tmpdir, 'outline.json', content='{"a": 1}')
+    entry = manifest.make_entry(EPISODE, 'outline', path)
+    assert manifest.verify(entry) is None
+
+    # same size, different content
+    with open(path, 'w') as f:
+        f.write('{"a": 2}')
+    assert 'content' in manifest.verify(entry)
+
+    with open(path, 'w') as f:
+        f.write('{}')
+    assert 'size' in manifest.verify(entry)
+
+    os.remove(path)
+    assert 'exist' in manifest.verify(entry)
+
+
+def test_shared(tmpdir):
+
+    root = str(tmpdir)
+    path = str(tmpdir.join('manifest.json'))
+
+    # e.g. two processes working on the same TVD root
+    first = Manifest(path, root)
+    second = Manifest(path, root)
+
+    first.update([first.make_entry(EPISODE, 'outline',
+                                   _resource(tmpdir, 'outline.json'))])
+    second.update([second.make_entry(EPISODE, 'speaker',
+                                     _resource(tmpdir, 'speaker.json'))])
+
+    manifest = Manifest(path, root)
+    assert len(manifest) == 2
+    assert (EPISODE, 'outline') in manifest
+    assert (EPISODE, 'speaker') in manifest
+
+    first.remove(EPISODE, 'outline')
+    assert list(Manifest(path, root)) == [second.get(EPISODE, 'speaker')]
+
+
+def test_corrupted(tmpdir):
+
+    root = str(tmpdir)
+    path = tmpdir.join('manifest.json')
+    path.write('{"TVDTestSeries')
+
+    manifest = Manifest(str(path), root)
+    assert len(manifest) == 0
+
+    manifest.update([manifest.make_entry(EPISODE, 'outline',
+                                         _resource(tmpdir, 'outline.json'))])
+    assert len(Manifest(str(path), root)) == 1
+
+
+def test_removed_resource(series):
+
+    episode = sorted(series.resources)[0]
+    path = series.save_resource('outline', episode, {'outline': 1})
+    series.flush_manifest()
+
+    assert not series.is_outdated('outline', episode)
+
+    os.remove(path)
+
+    # as seen by "create metadata", with or without --sync
+    series = series.__class__(series.tvd_dir, acknowledgment=False)
+    assert (episode, 'outline') in series.manifest
+    assert not series.on_disk('outline', episode)
+    assert series.is_outdated('outline', episode)
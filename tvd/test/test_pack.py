@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+import stat
+
+import pytest
+from pyannote.core import Segment, Annotation
+
+from tvd import Episode
+from tvd.core.pack import PackWriter, Pack, open_pack, forget_pack
+
+
+EPISODE = Episode(series='TheBigBangTheory', season=1, episode=2)
+
+
+def _annotation():
+    annotation = Annotation(uri=EPISODE)
+    annotation[Segment(0., 1.), 'track'] = 'sheldon'
+    return annotation
+
+
+def test_pack(tmpdir):
+
+    path = str(tmpdir.join('resources.pack'))
+    with PackWriter(path) as writer:
+        writer.add(EPISODE, 'speaker', _annotation())
+        writer.add(EPISODE, 'outline', {'text': 'Pilot'})
+
+    pack = Pack(path)
+
+    assert len(pack) == 2
+    assert (EPISODE, 'speaker') in pack
+    assert (EPISODE, 'transcript') not in pack
+
+    annotation = pack.load(EPISODE, 'speaker')
+    assert annotation.uri == EPISODE
+    assert list(annotation.itertracks(label=True)) == \
+        list(_annotation().itertracks(label=True))
+
+    assert pack.load(EPISODE, 'outline') == {'text': 'Pilot'}
+    assert pack.size(EPISODE, 'outline') == \
+        len(pack.get_text(EPISODE, 'outline').encode('utf-8'))
+
+    with pytest.raises(KeyError):
+        pack.load(EPISODE, 'transcript')
+
+    pack.close()
+
+
+def test_pack_mode(tmpdir):
+
+    path = str(tmpdir.join('resources.pack'))
+    with PackWriter(path):
+        pass
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_pack_failure(tmpdir):
+
+    path = str(tmpdir.join('resources.pack'))
+    with pytest.raises(RuntimeError):
+        with PackWriter(path):
+            raise RuntimeError()
+
+    # neither pack nor temporary file is left behind
+    assert tmpdir.listdir() == []
+
+
+def test_not_a_pack(tmpdir):
+
+    path = tmpdir.join('resources.pack')
+    path.write_binary(b'\0' * 64)
+
+    with pytest.raises(ValueError):
+        Pack(str(path))
+
+
+def test_open_pack(tmpdir):
+
+    path = str(tmpdir.join('resources.pack'))
+    assert open_pack(path) is None
+
+    with PackWriter(path) as writer:
+        writer.add(EPISODE, 'outline', {'text': 'Pilot'})
+
+    # missing pack is remembered...
+    assert open_pack(path) is None
+    # ... until forgotten
+    forget_pack(path)
+    pack = open_pack(path)
+    assert pack is open_pack(path)
+    assert pack.load(EPISODE, 'outline') == {'text': 'Pilot'}
+    forget_pack(path)
+
+
+def test_plugin_pack(series):
+
+    episode = sorted(series.resources)[0]
+    series.save_resource('outline', episode, {'version': 1})
+    series.flush_manifest()
+
+    assert series.pack_resources() == 1
+    series.evict_resources()
+    assert series._path_to_existing_resource('outline', episode) == \
+        series.path_to_pack()
+    assert series.get_resource('outline', episode) == {'version': 1}
+
+    # resources saved after the pack was created win...
+    series.save_resource('outline', episode, {'version': 2})
+    series.evict_resources()
+    assert series.get_resource('outline', episode) == {'version': 2}
+
+    # ... and are packed from their own file next time
+    series.pack_resources()
+    pack = open_pack(series.path_to_pack())
+    assert pack.load(episode, 'outline') == {'version': 2}
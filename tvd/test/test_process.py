@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+from pyannote.core import Annotation, Transcription
+
+
+def test_build_resources(series):
+
+    items = list(series.iter_resources(data=False))
+    built = list(series.build_resources(items, max_workers=2))
+
+    assert sorted((e, r) for e, r, _, _ in built) == sorted(items)
+
+    for episode, resource_type, resource, error in built:
+
+        if resource_type == 'failing':
+            assert resource is None
+            assert isinstance(error, ValueError)
+            assert series.resource_status(resource_type, episode) == \
+                series.RESOURCE_FAILED
+            continue
+
+        assert error is None
+        assert series.in_memory(resource_type, episode)
+
+    # plugin methods were called by worker processes
+    assert series.calls == []
+
+    episode = sorted(series.resources)[0]
+    speaker = series.get_resource('speaker', episode)
+    assert isinstance(speaker, Annotation)
+    assert speaker.uri == episode
+    transcript = series.get_resource('transcript', episode)
+    assert isinstance(transcript, Transcription)
+    assert sorted(t for t in transcript.nodes() if t.drifting) == ['A', 'B']
+
+
+def test_get_resources(series):
+
+    episode = sorted(series.resources)[0]
+    series.save_resource('outline', episode,
+                         series.get_resource('outline', episode))
+    series.evict_resources()
+    series.get_resource('speaker', episode)
+
+    resources, errors = series.get_resources(processes=True, max_workers=2)
+
+    assert sorted(resources[episode]) == ['outline', 'speaker', 'transcript']
+    assert list(errors) == [sorted(series.resources)[1]]
+    assert list(errors[sorted(series.resources)[1]]) == ['failing']
+
+    # loaded from disk, in a worker process
+    assert resources[episode]['outline'] == \
+        {'episode': episode, 'outline': 'http://example.com/1'}
+    assert series.in_memory('outline', episode)
+
+    # threads and processes agree
+    threads, _ = series.get_resources()
+    assert sorted(threads) == sorted(resources)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tvd.plugin.registry import SeriesPlugins, resource_filename
+
+SERIES = 'TVDTestSeries'
+
+
+@pytest.fixture
+def registry(plugin_class, tmpdir):
+    return SeriesPlugins(cache=str(tmpdir.join('series.json')))
+
+
+def test_lazy(registry, plugin_class):
+
+    assert SERIES in registry.names()
+    assert SERIES in registry
+    assert not registry.is_loaded(SERIES)
+
+    assert registry[SERIES] is plugin_class
+    assert registry.is_loaded(SERIES)
+
+    with pytest.raises(KeyError):
+        registry['NotInstalled']
+
+
+def test_cache(registry, monkeypatch):
+
+    names = registry.names()
+    assert os.path.exists(registry.cache)
+
+    # other processes do not scan installed distributions again
+    def _scan():
+        raise AssertionError('entry points were scanned')
+
+    other = SeriesPlugins(cache=registry.cache)
+    monkeypatch.setattr(other, '_scan', _scan)
+    assert other.names() == names
+
+
+def test_cache_invalidation(registry, installer, tmpdir, monkeypatch):
+
+    directory = tmpdir.mkdir('site-packages')
+    monkeypatch.syspath_prepend(str(directory))
+    assert 'OtherSeries' not in registry.names()
+
+    # e.g. pip install
+    installer(directory, 'OtherSeries')
+    stat = os.stat(str(directory))
+    os.utime(str(directory), (stat.st_atime, stat.st_mtime + 10))
+
+    other = SeriesPlugins(cache=registry.cache)
+    assert 'OtherSeries' in other.names()
+    assert SERIES in other.names()
+
+    # refresh forgets entry points read so far
+    assert 'OtherSeries' not in registry.names()
+    registry.refresh()
+    assert 'OtherSeries' in registry.names()
+
+
+def test_no_cache(plugin_class, tmpdir):
+
+    registry = SeriesPlugins(cache=False)
+    assert SERIES in registry.names()
+    assert tmpdir.listdir() == []
+
+
+def test_resource_filename(plugin_class):
+
+    path = resource_filename(SERIES, 'tvd.yml')
+    assert os.path.exists(path)
+    assert path == os.path.join(
+        os.path.dirname(sys.modules[SERIES].__file__), 'tvd.yml')
+
+
+SLOW_PLUGIN = '''
+import time
+from tvd import Plugin
+
+
+class SlowSeries(Plugin):
+
+    # number of instances created so far
+    instances = 0
+
+    def __init__(self, root, acknowledgment=True):
+        SlowSeries.instances += 1
+        time.sleep(0.5)
+        if root.endswith('error'):
+            raise IOError(root)
+        super(SlowSeries, self).__init__(root, acknowledgment=acknowledgment)
+'''
+
+SLOW_CONFIG = '''
+name: Slow series
+language: en
+'''
+
+
+def test_instance(registry, plugin_class, tmpdir):
+
+    root = str(tmpdir.join('tvd'))
+
+    series = registry.instance(SERIES, root, acknowledgment=False)
+    assert isinstance(series, plugin_class)
+    assert registry.instance(SERIES, root) is series
+    assert registry.instance(SERIES, root + os.sep) is series
+    assert registry.instance(SERIES, str(tmpdir.join('other'))) is not series
+
+    registry.clear_instances(root=root)
+    assert registry.instance(SERIES, root) is not series
+
+    registry.clear_instances()
+    assert registry._instances == {}
+
+
+def test_instance_concurrency(installer, tmpdir, monkeypatch):
+
+    directory = tmpdir.mkdir('site-packages')
+    monkeypatch.syspath_prepend(str(directory))
+    installer(directory, 'SlowSeries', plugin=SLOW_PLUGIN, config=SLOW_CONFIG)
+
+    registry = SeriesPlugins(cache=False)
+    slow_class = registry['SlowSeries']
+    root = str(tmpdir.join('tvd'))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+
+        slow = [executor.submit(registry.instance, 'SlowSeries', root)
+                for _ in range(3)]
+
+        # other series are not blocked while SlowSeries is instantiated
+        time.sleep(0.1)
+        start = time.time()
+        registry.instance(SERIES, root, acknowledgment=False)
+        assert time.time() - start < 0.3
+        assert not slow[0].done()
+
+        # concurrent requests share the same instance
+        instances = [future.result() for future in slow]
+
+    assert all(instance is instances[0] for instance in instances)
+    assert slow_class.instances == 1
+
+    # failed instantiations are not remembered
+    for _ in range(2):
+        with pytest.raises(IOError):
+            registry.instance('SlowSeries', root + 'error')
+    assert slow_class.instances == 3
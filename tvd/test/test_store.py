@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import os
+
+import pytest
+from pyannote.core import Segment, Annotation
+
+from tvd import Episode
+from tvd.core.store import SQLiteStore, open_store, forget_store
+
+
+SERIES = 'TheBigBangTheory'
+
+
+def _episode(season, episode):
+    return Episode(series=SERIES, season=season, episode=episode)
+
+
+def test_store(tmpdir):
+
+    store = SQLiteStore(str(tmpdir.join('tvd.sqlite')), create=True)
+
+    episode = _episode(1, 2)
+    annotation = Annotation(uri=episode)
+    annotation[Segment(0., 1.), 'track'] = 'sheldon'
+    store.put(episode, 'speaker', annotation)
+
+    assert (episode, 'speaker') in store
+    assert (episode, 'outline') not in store
+
+    loaded = store.load(episode, 'speaker')
+    assert loaded.uri == episode
+    assert list(loaded.itertracks(label=True)) == \
+        list(annotation.itertracks(label=True))
+
+    assert store.get_size(episode, 'speaker') == \
+        len(store.get_text(episode, 'speaker'))
+
+    # replace
+    store.put(episode, 'speaker', {'text': 'replaced'})
+    assert store.load(episode, 'speaker') == {'text': 'replaced'}
+
+    with pytest.raises(KeyError):
+        store.load(episode, 'outline')
+    with pytest.raises(KeyError):
+        store.get_size(episode, 'outline')
+
+
+def test_query(tmpdir):
+
+    store = SQLiteStore(str(tmpdir.join('tvd.sqlite')), create=True)
+    store.put_many([(_episode(2, 1), 'outline', {}),
+                    (_episode(1, 2), 'speaker', {}),
+                    (_episode(1, 2), 'outline', {}),
+                    (_episode(1, 1), 'outline', {}),
+                    (Episode(series='GameOfThrones', season=1, episode=1),
+                     'outline', {})])
+
+    assert store.query(SERIES) == [(_episode(1, 1), 'outline'),
+                                   (_episode(1, 2), 'outline'),
+                                   (_episode(1, 2), 'speaker'),
+                                   (_episode(2, 1), 'outline')]
+
+    assert store.query(SERIES, resource_type='speaker') == \
+        [(_episode(1, 2), 'speaker')]
+
+    assert store.query(SERIES, season=1, resource_type='outline') == \
+        [(_episode(1, 1), 'outline'), (_episode(1, 2), 'outline')]
+
+
+def test_fork(tmpdir):
+
+    store = SQLiteStore(str(tmpdir.join('tvd.sqlite')), create=True)
+    connection = store._connection()
+
+    # forked children must not reuse their parent's connection
+    store._pid = -1
+    assert store._connection() is not connection
+
+
+def test_open_store(tmpdir):
+
+    path = str(tmpdir.join('tvd.sqlite'))
+
+    assert open_store(path) is None
+    assert not os.path.exists(path)
+
+    store = open_store(path, create=True)
+    assert store is open_store(path)
+    store.put(_episode(1, 1), 'outline', {})
+
+    forget_store(path)
+    assert open_store(path).load(_episode(1, 1), 'outline') == {}
+    forget_store(path)
+
+
+def test_plugin_store(series):
+
+    for episode, resource_type in series.iter_resources(data=False):
+        if resource_type != 'failing':
+            series.save_resource(resource_type, episode,
+                                 series.get_resource(resource_type, episode))
+
+    assert series.stored_resources() == []
+    assert series.store_resources() == 5
+
+    episode = sorted(series.resources)[0]
+    assert series.stored_resources(resource_type='transcript') == \
+        [(episode, 'transcript')]
+    assert len(series.stored_resources(season=1)) == 5
+
+    # resources are loaded from the store from now on...
+    series.evict_resources()
+    assert series._path_to_existing_resource('outline', episode) == \
+        series.path_to_store()
+    assert series.get_resource('outline', episode) == \
+        {'episode': episode, 'outline': 'http://example.com/1'}
+
+    # ... which is kept up to date
+    series.save_resource('outline', episode, {'outline': 2})
+    series.evict_resources()
+    assert series.get_resource('outline', episode) == {'outline': 2}
+
+    forget_store(series.path_to_store())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+#
+# The MIT License (MIT)
+#
+# Copyright (c) 2013-2015 CNRS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# AUTHORS
+# Hervé BREDIN -- http://herve.niderb.fr/
+
+
+import copy
+import os
+import sys
+
+from tvd.core.manifest import MANIFEST_FINGERPRINT
+
+
+def _save_all(series):
+    for episode, resource_type in series.iter_resources(data=False):
+        if resource_type != 'failing':
+            series.save_resource(resource_type, episode,
+                                 series.get_resource(resource_type, episode))
+    series.flush_manifest()
+
+
+def _outdated(series):
+    return [(episode, resource_type)
+            for episode, resource_type in series.iter_resources(data=False)
+            if series.is_outdated(resource_type, episode)]
+
+
+def test_fingerprint(series):
+
+    first, second = sorted(series.resources)
+
+    assert series.resource_fingerprint('outline', first) == \
+        series.resource_fingerprint('outline', first)
+    assert series.resource_fingerprint('outline', first) != \
+        series.resource_fingerprint('outline', second)
+    assert series.resource_fingerprint('outline', first) != \
+        series.resource_fingerprint('speaker', first)
+
+
+def test_outdated(series):
+
+    assert len(_outdated(series)) == 6
+
+    _save_all(series)
+    episode = sorted(series.resources)[1]
+    assert _outdated(series) == [(episode, 'failing')]
+
+    # URL of one resource changed in YAML configuration
+    resources = copy.deepcopy(series.config['resources'])
+    resources['outline']['url'][1]['url'] = 'http://example.com/new'
+    series.init_resource(resources)
+    assert _outdated(series) == [(episode, 'failing'), (episode, 'outline')]
+
+
+def test_plugin_version(series, monkeypatch):
+
+    _save_all(series)
+
+    module = sys.modules[series.__class__.__module__]
+    monkeypatch.setattr(module, '__version__', '2.0', raising=False)
+    assert series.plugin_version() == '2.0'
+    assert len(_outdated(series)) == 6
+
+
+def test_update_manifest(series):
+
+    _save_all(series)
+
+    # e.g. resources saved before manifests were introduced
+    os.remove(series.path_to_manifest())
+    series.init_resource(series.config['resources'])
+    assert len(series.manifest) == 0
+    assert series.missing_resources() == _outdated(series)
+
+    assert series.update_manifest() == 5
+    assert series.update_manifest() == 0
+    assert len(series.missing_resources()) == 1
+
+    # adopted resources have unknown fingerprint: they are outdated
+    assert all(entry[MANIFEST_FINGERPRINT] is None
+               for entry in series.manifest)
+    assert len(_outdated(series)) == 6